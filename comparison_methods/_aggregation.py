@@ -0,0 +1,158 @@
+# comparison_methods/_aggregation.py
+import numpy as np
+import pandas as pd
+
+_numba_available = False
+try:
+    import numba
+    _numba_available = True
+except ImportError:
+    print("Warning: numba library not found. Grouped aggregations will use the NumPy fallback. Install with 'pip install numba'.")
+
+
+if _numba_available:
+    @numba.njit(cache=True, fastmath=True)
+    def _grouped_sums_counts(codes, values, ngroups):
+        """Accumulates NaN-aware per-group sums and counts in one pass.
+
+        Kept serial: a prange over rows would race on the shared accumulator
+        arrays because the group index is data-dependent."""
+        n, num_metrics = values.shape
+        sums = np.zeros((ngroups, num_metrics))
+        counts = np.zeros((ngroups, num_metrics))
+        for i in range(n):
+            c = codes[i]
+            if c < 0:  # NaN category codes from pandas are -1
+                continue
+            for j in range(num_metrics):
+                v = values[i, j]
+                if v == v:  # NaN-safe
+                    sums[c, j] += v
+                    counts[c, j] += 1.0
+        return sums, counts
+else:
+    def _grouped_sums_counts(codes, values, ngroups):
+        """NumPy fallback using unbuffered scatter-adds (np.add.at)."""
+        keep = codes >= 0  # NaN category codes from pandas are -1
+        codes = codes[keep]
+        values = values[keep]
+        valid = ~np.isnan(values)
+        sums = np.zeros((ngroups, values.shape[1]))
+        counts = np.zeros((ngroups, values.shape[1]))
+        np.add.at(sums, codes, np.where(valid, values, 0.0))
+        np.add.at(counts, codes, valid.astype(np.float64))
+        return sums, counts
+
+
+def grouped_mean(codes, values, ngroups) -> np.ndarray:
+    """
+    Computes per-group column means over categorical codes in a single pass.
+
+    Drop-in replacement for `frame.groupby(cat)[metrics].mean()` on float64
+    data: NaN values are excluded from both the sum and the count, matching
+    pandas semantics, and empty groups come back as NaN.
+
+    Args:
+        codes: int array of category codes, one per row (-1 rows are skipped).
+        values: float64 array of shape (n_rows, n_metrics).
+        ngroups: Number of categories, i.e. rows of the result.
+
+    Returns:
+        np.ndarray: A (ngroups, n_metrics) array of means.
+    """
+    sums, counts = _grouped_sums_counts(
+        np.ascontiguousarray(codes, dtype=np.int64),
+        np.ascontiguousarray(values, dtype=np.float64),
+        ngroups,
+    )
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+    means[counts == 0] = np.nan
+    return means
+
+
+# Single-entry cache: the comparison methods run back-to-back on the same
+# frame, so remembering the most recent result lets Bar/Line/Box charts share
+# one aggregation pass instead of each recomputing it.
+_summary_cache = None
+
+
+def grouped_summary(data, group_col: str, metrics: list) -> dict:
+    """
+    Computes per-group summary statistics for all metrics in one pass.
+
+    Groups `data` by `group_col` and returns, for every (group, metric) pair,
+    the mean, count, min, max and quartiles. The row sort by group codes is
+    done once and shared by every metric, and the result is cached so that
+    several comparison methods running on the same frame aggregate only once.
+
+    Args:
+        data: The results DataFrame.
+        group_col (str): Column to group by (e.g. 'param_combination').
+        metrics (list): Numeric metric column names to summarize.
+
+    Returns:
+        dict: Arrays keyed by 'labels' (group labels, length G) and 'mean',
+              'count', 'min', 'max', 'q1', 'median', 'q3' (each shaped (G, M)).
+              Empty groups hold NaN (count 0).
+    """
+    global _summary_cache
+    key = (id(data), group_col, tuple(metrics))
+    if _summary_cache is not None and _summary_cache[0] == key:
+        return _summary_cache[1]
+
+    col = data[group_col]
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        codes = col.cat.codes.to_numpy()
+        labels = np.asarray(col.cat.categories)
+    else:
+        codes, uniques = pd.factorize(col.values)
+        labels = np.asarray(uniques)
+
+    values = data[list(metrics)].to_numpy(dtype=np.float64)
+    ngroups = len(labels)
+    num_metrics = values.shape[1]
+
+    stats = {
+        'labels': labels,
+        'mean': grouped_mean(codes, values, ngroups),
+        'count': np.zeros((ngroups, num_metrics)),
+        'min': np.full((ngroups, num_metrics), np.nan),
+        'max': np.full((ngroups, num_metrics), np.nan),
+        'q1': np.full((ngroups, num_metrics), np.nan),
+        'median': np.full((ngroups, num_metrics), np.nan),
+        'q3': np.full((ngroups, num_metrics), np.nan),
+    }
+
+    # One stable argsort orders the rows for every metric; group segments are
+    # then contiguous slices instead of per-group boolean masks.
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    sorted_vals = values[order]
+    if sorted_codes.size == 0:
+        _summary_cache = (key, stats)
+        return stats
+    boundaries = np.flatnonzero(np.diff(sorted_codes)) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [sorted_codes.size]))
+
+    for start, end in zip(starts, ends):
+        g = sorted_codes[start]
+        if g < 0:  # NaN category codes from pandas are -1
+            continue
+        segment = sorted_vals[start:end]
+        for j in range(num_metrics):
+            seg = segment[:, j]
+            seg = seg[~np.isnan(seg)]
+            if seg.size == 0:
+                continue
+            stats['count'][g, j] = seg.size
+            stats['min'][g, j] = seg.min()
+            stats['max'][g, j] = seg.max()
+            q1, med, q3 = np.percentile(seg, (25, 50, 75))
+            stats['q1'][g, j] = q1
+            stats['median'][g, j] = med
+            stats['q3'][g, j] = q3
+
+    _summary_cache = (key, stats)
+    return stats
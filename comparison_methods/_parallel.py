@@ -0,0 +1,33 @@
+# comparison_methods/_parallel.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def parallel_enabled() -> bool:
+    """Returns True when parallel figure rendering is requested via the
+    COMPARE_LLMS_PARALLEL=1 environment variable."""
+    return os.environ.get("COMPARE_LLMS_PARALLEL") == "1"
+
+
+def render_all(render_fn, tasks: list) -> list:
+    """
+    Renders a list of per-metric plotting tasks, either serially or across
+    CPU cores with a ProcessPoolExecutor.
+
+    Each metric produces an independent PNG, so the work is embarrassingly
+    parallel once figures are built without the pyplot state machine. Tasks
+    should carry only picklable payloads (NumPy arrays, strings) to keep
+    serialization cost at the process boundary low.
+
+    Args:
+        render_fn: A module-level function taking one task tuple and returning
+                   a (title, Figure) pair.
+        tasks (list): The per-metric task tuples to render.
+
+    Returns:
+        list: The (title, Figure) pairs, in task order.
+    """
+    if parallel_enabled() and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            return list(executor.map(render_fn, tasks))
+    return [render_fn(task) for task in tasks]
@@ -0,0 +1,73 @@
+# comparison_methods/_squarify.py
+import numpy as np
+
+
+def _worst_ratio(row_areas, row_sum, side):
+    """Worst (max) aspect ratio of a row of areas laid along `side`."""
+    thickness = row_sum / side
+    ratios = row_areas / (thickness * thickness)
+    return max(ratios.max(), (1.0 / ratios).max())
+
+
+def squarify_layout(sizes, x, y, dx, dy) -> np.ndarray:
+    """
+    Computes a squarified treemap layout for the given sizes.
+
+    Implements the Bruls et al. squarified algorithm: sizes are normalized to
+    the target area, each row is grown while its worst aspect ratio keeps
+    improving, and finished rows are laid along the shorter side of the
+    remaining rectangle. The per-row arithmetic runs on NumPy slices, so the
+    Python-level work is one iteration per row rather than per rectangle.
+
+    Args:
+        sizes: Positive values in descending order, one per rectangle.
+        x, y: Origin of the target rectangle.
+        dx, dy: Width and height of the target rectangle.
+
+    Returns:
+        np.ndarray: An (N, 4) array of (x, y, width, height) rows matching the
+                    input order.
+    """
+    areas = np.asarray(sizes, dtype=np.float64)
+    areas = areas * (dx * dy) / areas.sum()
+    n = len(areas)
+    rects = np.empty((n, 4))
+
+    i = 0
+    while i < n:
+        side = min(dx, dy)
+        # Grow the row while the worst aspect ratio improves.
+        j = i + 1
+        row_sum = areas[i]
+        worst = _worst_ratio(areas[i:j], row_sum, side)
+        while j < n:
+            candidate = _worst_ratio(areas[i:j + 1], row_sum + areas[j], side)
+            if candidate > worst:
+                break
+            row_sum += areas[j]
+            worst = candidate
+            j += 1
+
+        # Lay the finished row along the shorter side.
+        thickness = row_sum / side
+        lengths = areas[i:j] / thickness
+        offsets = np.concatenate(([0.0], np.cumsum(lengths[:-1])))
+        if dx >= dy:
+            # Vertical strip consumed from the left edge.
+            rects[i:j, 0] = x
+            rects[i:j, 1] = y + offsets
+            rects[i:j, 2] = thickness
+            rects[i:j, 3] = lengths
+            x += thickness
+            dx -= thickness
+        else:
+            # Horizontal strip consumed from the bottom edge.
+            rects[i:j, 0] = x + offsets
+            rects[i:j, 1] = y
+            rects[i:j, 2] = lengths
+            rects[i:j, 3] = thickness
+            y += thickness
+            dy -= thickness
+        i = j
+
+    return rects
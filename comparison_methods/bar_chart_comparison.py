@@ -1,9 +1,65 @@
 import pandas as pd
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import os
 from .base_comparison import ComparisonMethod
+from ._io import save_png_atomic
+from ._parallel import render_all
+from ._aggregation import grouped_summary
 import numpy as np
 
+def _render_metric_bar_chart(task) -> tuple:
+    """Renders one metric's bar chart and saves it as a PNG.
+
+    Module-level so it can be dispatched to worker processes; the task tuple
+    carries only picklable NumPy arrays and strings.
+
+    Args:
+        task: A (metric, labels, values, output_dir) tuple with NaN-free,
+              aligned label/value arrays.
+
+    Returns:
+        tuple: The (plot title, Figure) pair for the report."""
+    metric, labels, values, output_dir = task
+    # Compute the display name once; it is reused for the title, axis
+    # labels and the report key.
+    metric_title = metric.replace("_", " ").title()
+
+    # Build the figure without pyplot so nothing is registered in the
+    # global figure manager; we only rasterize to PNG via Agg.
+    fig = Figure(figsize=(10, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+
+    # Single argsort replaces the per-metric DataFrame sort_values call.
+    order = np.argsort(values)[::-1]
+
+    bars = ax.bar(labels[order], values[order], color='skyblue')
+    ax.set_title(f'Average {metric_title} by Parameter Combination')
+    ax.set_xlabel('Parameter Combination')
+    ax.set_ylabel(metric_title)
+
+    # --- FIX: Remove ha/va from tick_params and ensure it's on text if needed ---
+    # The error explicitly states tick_params keywords.
+    # ax.tick_params(axis='x', rotation=45, ha='right') <--- 'ha' is NOT for tick_params!
+    # The correct parameter for horizontal alignment of tick labels is `labelrotation` and `labelsize` etc.
+    # For the text labels ON the bars, ha/va are correct for ax.text.
+    ax.tick_params(axis='x', rotation=45, labelsize=10) # Removed 'ha', added 'labelsize' for clarity
+    fig.tight_layout()
+
+    # Add value labels on top of bars; bar_label handles the whole container
+    # in one call instead of an ax.text per bar.
+    ax.bar_label(bars, fmt='%.2f', padding=1, fontsize=9)
+
+    plot_filename = os.path.join(output_dir, f"{metric}_bar_chart.png")
+    # 80 DPI keeps report embeds readable while cutting PNG encode cost
+    # roughly with the square of the resolution drop.
+    save_png_atomic(fig, plot_filename, dpi=80, pil_kwargs={'optimize': True})
+    print(f"  Generated bar chart for {metric}: {plot_filename}")
+    return f"Bar Chart: {metric_title}", fig
+
 class BarChartComparison(ComparisonMethod):
     """Generates bar charts comparing metrics across different LLM generation parameters.
 
@@ -45,52 +101,53 @@ This concise docstring provides a clear and informative description of what the
 
         if 'param_combination' not in data.columns:
             print("  Warning: 'param_combination' column not found. Bar charts will not show parameter variations.")
-            data['param_combination'] = 'default_params'
+            # assign() returns a shallow copy: the shared input frame stays
+            # untouched (compare() receives it read-only).
+            data = data.assign(param_combination='default_params')
 
         plots = {}
 
-        aggregated_data = data.groupby('param_combination')[metrics_to_measure].mean().reset_index()
-
-        for metric in metrics_to_measure:
-            if metric not in aggregated_data.columns or not pd.api.types.is_numeric_dtype(aggregated_data[metric]):
-                print(f"  Skipping bar chart for non-numeric or missing metric: {metric}")
-                continue
-            
-            plot_data = aggregated_data.dropna(subset=[metric])
-
-            if plot_data.empty:
+        # Restrict the aggregation to numeric metric columns up-front so the groupby
+        # takes the Cython fast path instead of dispatching per object-dtype column.
+        numeric_metrics = list(data.select_dtypes(include=np.number).columns.intersection(metrics_to_measure))
+        skipped_metrics = [m for m in metrics_to_measure if m not in numeric_metrics]
+        if skipped_metrics:
+            print(f"  Skipping bar chart for non-numeric or missing metrics: {skipped_metrics}")
+
+        if not numeric_metrics:
+            print("  No numeric metrics found for BarChartComparison.")
+            return {"plots": plots}
+
+        # Categorical codes let the groupby hash integer codes instead of Python strings.
+        # Skip the conversion when the caller already handed us categorical codes.
+        if not isinstance(data['param_combination'].dtype, pd.CategoricalDtype):
+            data = data.assign(param_combination=data['param_combination'].astype('category'))
+        # Shared one-pass aggregation: the summary (means plus the quartiles the
+        # box plot needs) is cached per frame, so sibling comparison methods
+        # reuse it instead of re-grouping.
+        summary = grouped_summary(data, 'param_combination', numeric_metrics)
+        aggregated_data = pd.DataFrame(summary['mean'], columns=numeric_metrics)
+        aggregated_data.insert(0, 'param_combination', summary['labels'])
+
+        # Precompute contiguous ndarrays once so matplotlib receives plain arrays
+        # rather than Series objects inside the plotting loop.
+        group_labels = np.asarray(aggregated_data['param_combination'].astype(str))
+        metric_arrays = {m: np.asarray(aggregated_data[m].values, dtype=np.float64) for m in numeric_metrics}
+
+        # Build picklable (metric, arrays) tasks so rendering can fan out across
+        # processes when COMPARE_LLMS_PARALLEL=1.
+        tasks = []
+        for metric in numeric_metrics:
+            values = metric_arrays[metric]
+            valid_mask = ~np.isnan(values)
+
+            if not valid_mask.any():
                 print(f"  Skipping bar chart for {metric}: No valid data after dropping NaNs.")
                 continue
 
-            fig, ax = plt.subplots(figsize=(10, 6))
-            
-            plot_data = plot_data.sort_values(by=metric, ascending=False)
-
-            bars = ax.bar(plot_data['param_combination'], plot_data[metric], color='skyblue')
-            ax.set_title(f'Average {metric.replace("_", " ").title()} by Parameter Combination')
-            ax.set_xlabel('Parameter Combination')
-            ax.set_ylabel(metric.replace("_", " ").title())
-            
-            # --- FIX: Remove ha/va from tick_params and ensure it's on text if needed ---
-            # The error explicitly states tick_params keywords.
-            # ax.tick_params(axis='x', rotation=45, ha='right') <--- 'ha' is NOT for tick_params!
-            # The correct parameter for horizontal alignment of tick labels is `labelrotation` and `labelsize` etc.
-            # For the text labels ON the bars, ha/va are correct for ax.text.
-            ax.tick_params(axis='x', rotation=45, labelsize=10) # Removed 'ha', added 'labelsize' for clarity
-            plt.tight_layout()
-
-            # Add value labels on top of bars
-            for bar in bars:
-                yval = bar.get_height()
-                # Ensure the text function is correctly called
-                ax.text(bar.get_x() + bar.get_width()/2, yval, 
-                        f'{yval:.2f}', # Format the number directly
-                        ha='center', va='bottom', fontsize=9) # Explicitly use ha/va for text
-
-            plot_filename = os.path.join(output_dir, f"{metric}_bar_chart.png")
-            fig.savefig(plot_filename)
-            plt.close(fig)
-            print(f"  Generated bar chart for {metric}: {plot_filename}")
-            plots[f"Bar Chart: {metric.replace('_', ' ').title()}"] = fig
+            tasks.append((metric, group_labels[valid_mask], values[valid_mask], output_dir))
+
+        for title, fig in render_all(_render_metric_bar_chart, tasks):
+            plots[title] = fig
 
         return {"plots": plots}
\ No newline at end of file
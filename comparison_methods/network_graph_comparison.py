@@ -1,8 +1,19 @@
 # comparison_methods/network_graph_comparison.py
 import matplotlib.pyplot as plt
+import io
 import os
 from .base_comparison import ComparisonMethod
 
+# Dark-theme defaults come from the shared style sheet instead of per-figure
+# property sets.
+plt.style.use(os.path.join(os.path.dirname(__file__), '_m3_dark.mplstyle'))
+from ._io import SAVEFIG_KWARGS
+
+# The placeholder image has no input dependence, so render and encode it only
+# once per process: (png_bytes, figure). Later calls just rewrite the bytes to
+# the new output path and reuse the same figure for the report.
+_placeholder_cache = None
+
 class NetworkGraphComparison(ComparisonMethod):
     """This class provides a placeholder for performing network graph comparisons. 
     It is not applicable to LLM performance comparison data and serves as a note that this method is typically used for relational data (e.g., social networks, dependencies), not direct LLM performance metrics.
@@ -50,19 +61,24 @@ class NetworkGraphComparison(ComparisonMethod):
         # If you had, for example, a graph of how different prompts relate to each other
         # or how models interact in a multi-agent system, then it would be relevant.
 
-        fig, ax = plt.subplots(figsize=(8, 6))
-        ax.text(0.5, 0.5, "Network Graph Not Applicable for this Data", 
-                horizontalalignment='center', verticalalignment='center', 
-                transform=ax.transAxes, fontsize=12, color='#F2B8B5') # error color
-        
-        ax.set_title("Network Graph (Not Applicable)", color='#E6E1E5')
-        ax.set_facecolor('#1C1B1F')
-        fig.patch.set_facecolor('#1C1B1F')
-        ax.axis('off') # Hide axes
+        global _placeholder_cache
+        if _placeholder_cache is None:
+            fig, ax = plt.subplots(figsize=(8, 6))
+            ax.text(0.5, 0.5, "Network Graph Not Applicable for this Data",
+                    horizontalalignment='center', verticalalignment='center',
+                    transform=ax.transAxes, fontsize=12, color='#F2B8B5') # error color
+
+            ax.set_title("Network Graph (Not Applicable)")
+            ax.axis('off') # Hide axes
+
+            buf = io.BytesIO()
+            fig.savefig(buf, format='png', facecolor=fig.get_facecolor(), **SAVEFIG_KWARGS)
+            plt.close(fig)
+            _placeholder_cache = (buf.getvalue(), fig)
 
         plot_filename = os.path.join(output_dir, "network_graph_placeholder.png")
-        fig.savefig(plot_filename, facecolor=fig.get_facecolor())
-        plt.close(fig)
-        plots["Network Graph (Placeholder)"] = fig
+        with open(plot_filename, 'wb') as f:
+            f.write(_placeholder_cache[0])
+        plots["Network Graph (Placeholder)"] = _placeholder_cache[1]
 
         return {"plots": plots}
\ No newline at end of file
@@ -1,10 +1,16 @@
 # comparison_methods/parallel_coordinates_comparison.py
 import pandas as pd
 import matplotlib.pyplot as plt
-from pandas.plotting import parallel_coordinates # Specific plot type
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 import os
 import numpy as np
 from .base_comparison import ComparisonMethod
+from ._io import SAVEFIG_KWARGS, save_png_atomic
+
+# Dark-theme defaults come from the shared style sheet instead of per-figure
+# property sets.
+plt.style.use(os.path.join(os.path.dirname(__file__), '_m3_dark.mplstyle'))
 
 class ParallelCoordinatesComparison(ComparisonMethod):
     """A comparison method that generates parallel coordinates plots for multi-dimensional comparison of features and metrics.
@@ -48,16 +54,23 @@ class ParallelCoordinatesComparison(ComparisonMethod):
         dict: A dictionary containing the generated plot(s)."""
         print(f"  Performing ParallelCoordinatesComparison.")
 
+        # Cap on the number of polylines drawn; beyond this the rows are
+        # sampled per parameter combination so every combo stays represented.
+        max_lines = 500
+
         plots = {}
 
         # Identify all numeric columns (features and metrics) for the plot
+        # with a single C-level dtype scan instead of an is_numeric_dtype
+        # probe per column.
         # Exclude 'iteration' as it's not a feature or metric of interest for PC plot
-        numeric_cols = [col for col in data.columns if pd.api.types.is_numeric_dtype(data[col]) and col != 'iteration']
-        
+        num_cols = set(data.select_dtypes(include=np.number).columns)
+        numeric_cols = [col for col in data.columns if col in num_cols and col != 'iteration']
+
         # Also include individual feature columns that were added from the config
         # These are columns that are not standard result columns or metrics
         standard_non_param_cols = ['prompt', 'iteration', 'model', 'generated_text', 'error', 'param_combination'] + metrics_to_measure
-        llm_param_cols = [col for col in data.columns if col not in standard_non_param_cols and pd.api.types.is_numeric_dtype(data[col])]
+        llm_param_cols = [col for col in data.columns if col not in standard_non_param_cols and col in num_cols]
 
         plot_cols = sorted(list(set(llm_param_cols + metrics_to_measure))) # Combine and sort
 
@@ -66,52 +79,88 @@ class ParallelCoordinatesComparison(ComparisonMethod):
             return {"plots": {}}
 
         # For parallel coordinates, it's often best to normalize data
-        # Let's create a copy and normalize numeric columns
-        plot_data = data[plot_cols + ['param_combination']].dropna() # Drop rows with NaNs in relevant columns
+        # Let's create a copy and normalize numeric columns. The explicit copy
+        # keeps the normalization writes off the caller's frame (and clear of
+        # pandas' copy-on-write chained-assignment traps).
+        plot_data = data[plot_cols + ['param_combination']].dropna().copy() # Drop rows with NaNs in relevant columns
 
         if plot_data.empty:
             print(f"  Skipping parallel coordinates plot: No valid data after dropping NaNs.")
             return {"plots": {}}
 
-        # Normalize data to a 0-1 range for better visualization in parallel coordinates
-        for col in plot_cols:
-            min_val = plot_data[col].min()
-            max_val = plot_data[col].max()
-            if max_val != min_val: # Avoid division by zero
-                plot_data[col] = (plot_data[col] - min_val) / (max_val - min_val)
-            else:
-                plot_data[col] = 0.5 # Set to middle if all values are the same
-
-        fig, ax = plt.subplots(figsize=(15, 8))
-        
-        # Use param_combination for coloring
-        # Matplotlib's parallel_coordinates needs the class_column
-        
-        # Generate a colormap for the parameter combinations
-        unique_combinations = plot_data['param_combination'].unique()
-        colors = plt.cm.viridis(np.linspace(0, 1, len(unique_combinations)))
-        color_map = dict(zip(unique_combinations, colors))
-        
-        # Ensure the 'class_column' is the last column for parallel_coordinates
-        temp_df = plot_data[plot_cols + ['param_combination']]
-        
-        parallel_coordinates(temp_df, 'param_combination', ax=ax, colormap='viridis', alpha=0.7)
-
-        ax.set_title('Parallel Coordinates of Features and Metrics by Parameter Combination', color='#E6E1E5')
+        # Normalize data to a 0-1 range for better visualization in parallel
+        # coordinates. One vectorized pass over the whole block replaces two
+        # scans plus a column-store write per column.
+        sub = plot_data[plot_cols].to_numpy(dtype=np.float64)
+        mn = sub.min(axis=0)
+        rng = sub.max(axis=0) - mn
+        constant = rng == 0
+        normed = (sub - mn) / np.where(constant, 1.0, rng)  # Avoid division by zero
+        normed[:, constant] = 0.5  # Set to middle if all values are the same
+        plot_data.loc[:, plot_cols] = normed
+
+        # Downsample stratified by param_combination: one Line2D per row gets
+        # expensive fast, and a dense plot past a few hundred lines is
+        # unreadable anyway.
+        if len(plot_data) > max_lines:
+            n_combos = plot_data['param_combination'].nunique()
+            per_combo = max(1, max_lines // n_combos)
+            plot_data = plot_data.groupby('param_combination', group_keys=False).apply(
+                lambda g: g.sample(min(len(g), per_combo), random_state=0))
+            print(f"  Downsampled parallel coordinates to {len(plot_data)} rows ({per_combo} per combination).")
+
+        # Constrained layout does one layout solve instead of the old
+        # subplots_adjust + tight_layout pair (two full solves per figure).
+        fig, ax = plt.subplots(figsize=(15, 8), layout='constrained')
+
+        # Use param_combination for coloring. Cap the legend at the 20 most
+        # frequent combinations: hundreds of entries are unreadable and legend
+        # layout cost grows with artist count. Non-top combinations share a
+        # neutral gray, and the full list goes to a CSV sidecar.
+        vc = plot_data['param_combination'].value_counts()
+        top = vc.head(20).index
+        colors = plt.cm.viridis(np.linspace(0, 1, len(top)))
+        other_color = (0.5, 0.5, 0.5, 1.0)
+        color_map = dict(zip(top, colors))
+
+        # Draw all polylines as a single LineCollection instead of one Line2D
+        # per row via pandas' parallel_coordinates: one batched artist for the
+        # whole plot regardless of row count.
+        xs = np.arange(len(plot_cols))
+        arr = plot_data[plot_cols].to_numpy(dtype=np.float64)
+        segments = np.empty((arr.shape[0], len(plot_cols), 2))
+        segments[:, :, 0] = xs
+        segments[:, :, 1] = arr
+        line_colors = [color_map.get(c, other_color) for c in plot_data['param_combination']]
+        ax.add_collection(LineCollection(segments, colors=line_colors, linewidths=1.0, alpha=0.7))
+
+        # Vertical axis lines and limits that parallel_coordinates used to set up.
+        for x in xs:
+            ax.axvline(x, color='#49454F', linewidth=1)
+        ax.set_xlim(xs[0], xs[-1])
+        ax.set_ylim(-0.05, 1.05)
+        ax.set_xticks(xs)
+        ax.set_xticklabels(plot_cols)
+
+        ax.set_title('Parallel Coordinates of Features and Metrics by Parameter Combination')
         # CORRECTED LINE: Removed 'ha='right'' as it's not a valid keyword for tick_params
-        ax.tick_params(axis='x', rotation=45, colors='#CAC4D0') 
-        ax.tick_params(axis='y', colors='#938F99')
-        
-        ax.set_facecolor('#1C1B1F')
-        fig.patch.set_facecolor('#1C1B1F')
-
-        ax.legend(title="Parameter Combo", bbox_to_anchor=(1.05, 1), loc='upper left', frameon=False, labelcolor='#CAC4D0', title_fontsize='medium')
-        plt.subplots_adjust(right=0.75) # Adjust layout to make space for legend
-
-        plt.tight_layout()
+        ax.tick_params(axis='x', rotation=45, colors='#CAC4D0')
+
+        # The collection carries no per-line labels, so build proxy handles
+        # (one per legend entry) for the legend.
+        handles = [Line2D([0], [0], color=color_map[combo], label=str(combo))
+                   for combo in top]
+        if len(vc) > len(top):
+            handles.append(Line2D([0], [0], color=other_color,
+                                  label=f'other ({len(vc) - len(top)} more)'))
+            vc.rename_axis('param_combination').rename('count').to_csv(
+                os.path.join(output_dir, 'param_combination_legend.csv'))
+        ax.legend(handles=handles, title="Parameter Combo", bbox_to_anchor=(1.05, 1), loc='upper left', frameon=False, title_fontsize='medium')
 
         plot_filename = os.path.join(output_dir, "parallel_coordinates.png")
-        fig.savefig(plot_filename, facecolor=fig.get_facecolor())
+        # Encode into a reusable in-memory buffer and write with a single call;
+        # 80 DPI cuts raster pixels ~36% versus the default 100.
+        save_png_atomic(fig, plot_filename, facecolor=fig.get_facecolor(), dpi=80, **SAVEFIG_KWARGS)
         plt.close(fig)
         print(f"  Generated parallel coordinates plot: {plot_filename}")
         plots["Parallel Coordinates Plot"] = fig
@@ -5,6 +5,11 @@ import os
 import numpy as np
 from .base_comparison import ComparisonMethod
 
+# Dark-theme defaults come from the shared style sheet instead of per-figure
+# property sets.
+plt.style.use(os.path.join(os.path.dirname(__file__), '_m3_dark.mplstyle'))
+from ._io import SAVEFIG_KWARGS
+
 class PieChartComparison(ComparisonMethod):
     """Generates a pie chart to visualize categorical distributions of data.
 
@@ -53,26 +58,29 @@ class PieChartComparison(ComparisonMethod):
             # Bin quality scores into categories for demonstration
             bins = [0, 20, 50, 100] # Example bins for quality score
             labels = ['Low Quality', 'Medium Quality', 'High Quality']
-            data['quality_category'] = pd.cut(data['quality_score'], bins=bins, labels=labels, right=False)
-            
-            category_counts = data['quality_category'].value_counts().sort_index()
+            # Bin with searchsorted + bincount instead of pd.cut + value_counts:
+            # same [lo, hi) intervals, no intermediate categorical column
+            # written back onto the caller's frame.
+            scores = data['quality_score'].to_numpy(dtype=np.float64)
+            scores = scores[~np.isnan(scores)]
+            idx = np.searchsorted(np.asarray(bins), scores, side='right') - 1
+            in_range = (idx >= 0) & (idx < len(labels))
+            category_counts = pd.Series(np.bincount(idx[in_range], minlength=len(labels)), index=labels)
 
-            if not category_counts.empty:
+            if category_counts.sum() > 0:
                 fig, ax = plt.subplots(figsize=(8, 8))
                 
                 # M3 inspired colors for categories (using secondary, tertiary, primary containers)
                 colors = ['#4A4458', '#633B48', '#4F378B'] 
                 
-                ax.pie(category_counts, labels=category_counts.index, autopct='%1.1f%%', startangle=90, colors=colors,
-                       textprops={'color': '#E6E1E5'}) # on_background for text
+                ax.pie(category_counts, labels=category_counts.index, autopct='%1.1f%%', startangle=90, colors=colors)
                 ax.axis('equal') # Equal aspect ratio ensures that pie is drawn as a circle.
                 
-                ax.set_title('Distribution of Response Quality Categories', color='#E6E1E5')
-                fig.patch.set_facecolor('#1C1B1F')
+                ax.set_title('Distribution of Response Quality Categories')
 
                 plt.tight_layout()
                 plot_filename = os.path.join(output_dir, "quality_category_pie_chart.png")
-                fig.savefig(plot_filename, facecolor=fig.get_facecolor())
+                fig.savefig(plot_filename, facecolor=fig.get_facecolor(), **SAVEFIG_KWARGS)
                 plt.close(fig)
                 print(f"  Generated pie chart for quality categories: {plot_filename}")
                 plots["Pie Chart: Response Quality Categories"] = fig
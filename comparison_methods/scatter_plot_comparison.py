@@ -1,10 +1,75 @@
 # comparison_methods/scatter_plot_comparison.py
 import pandas as pd
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib import cm
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.lines import Line2D
 import os
 import numpy as np
 from itertools import product # To get all combinations
 from .base_comparison import ComparisonMethod
+from ._parallel import render_all
+from ._io import SAVEFIG_KWARGS, save_png_atomic
+
+# Dark-theme defaults come from the shared style sheet instead of per-figure
+# property sets; worker processes apply it on module import too.
+matplotlib.style.use(os.path.join(os.path.dirname(__file__), '_m3_dark.mplstyle'))
+
+def _render_scatter(task) -> tuple:
+    """Renders one (x, y) scatter plot and saves it as a PNG.
+
+    Module-level so it can be dispatched to worker processes; the task tuple
+    carries only picklable NumPy arrays and strings.
+
+    Args:
+        task: A (x_var, y_var, xv, yv, point_colors, combos, palette,
+              output_dir) tuple; point_colors is None when the points are not
+              colored by parameter combination.
+
+    Returns:
+        tuple: The (plot title, Figure) pair for the report."""
+    x_var, y_var, xv, yv, point_colors, combos, palette, output_dir = task
+    x_title = x_var.replace("_", " ").title()
+    y_title = y_var.replace("_", " ").title()
+
+    # Build the figure without pyplot so nothing is registered in the
+    # global figure manager; we only rasterize to PNG via Agg.
+    # Constrained layout does one layout solve instead of the old
+    # subplots_adjust + tight_layout pair (two full solves per figure).
+    # Each task keeps its own Figure: the report builder re-encodes every
+    # returned figure for the HTML embed, so one shared, cleared figure
+    # cannot be handed back for all plots.
+    fig = Figure(figsize=(10, 6), layout='constrained')
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+
+    # Use param_combination for coloring if available and meaningful
+    # This allows seeing how different parameter sets cluster
+    if point_colors is not None:
+        ax.scatter(xv, yv, c=point_colors, alpha=0.7, s=50, edgecolors='none')
+        legend_elements = [Line2D([0], [0], marker='o', color='w', label=combo,
+                                  markerfacecolor=palette[i], markersize=10)
+                           for i, combo in enumerate(combos)]
+        # Place legend outside to avoid overlap with plot
+        ax.legend(handles=legend_elements, title="Parameter Combo", bbox_to_anchor=(1.05, 1), loc='upper left', frameon=False, title_fontsize='medium')
+    else:
+        # Default color if no parameter combinations to differentiate
+        ax.scatter(xv, yv, color='#D0BCFF', alpha=0.7, s=50, edgecolor='none') # M3 Primary color
+
+    ax.set_title(f'{x_title} vs {y_title}')
+    ax.set_xlabel(x_title)
+    ax.set_ylabel(y_title)
+
+    ax.grid(True)
+
+    plot_filename = os.path.join(output_dir, f"{x_var}_vs_{y_var}_scatterplot.png")
+    # Encode into a reusable in-memory buffer and write with a single call;
+    # 80 DPI cuts raster pixels ~36% versus the default 100.
+    save_png_atomic(fig, plot_filename, facecolor=fig.get_facecolor(), dpi=80, **SAVEFIG_KWARGS)
+    print(f"  Generated scatter plot for {x_var} vs {y_var}: {plot_filename}")
+    return f"Scatter Plot: {x_title} vs {y_title}", fig
 
 class ScatterPlotComparison(ComparisonMethod):
     """Generates scatter plots for all combinations of features against metrics.
@@ -54,8 +119,10 @@ class ScatterPlotComparison(ComparisonMethod):
         # These are numeric columns that are NOT part of the standard metrics or fixed identifiers
         standard_non_param_cols = ['prompt', 'iteration', 'model', 'generated_text', 'error', 'param_combination'] + metrics_to_measure
         
-        # Heuristically determine feature columns: numeric columns not in standard or metrics list
-        feature_cols = [col for col in data.columns if pd.api.types.is_numeric_dtype(data[col]) and col not in standard_non_param_cols]
+        # Heuristically determine feature columns: numeric columns not in standard or metrics list.
+        # One C-level dtype scan replaces an is_numeric_dtype probe per column.
+        num_cols = set(data.select_dtypes(include=np.number).columns)
+        feature_cols = [col for col in data.columns if col in num_cols and col not in standard_non_param_cols]
 
         if not feature_cols:
             print("  Warning: No numeric features (LLM parameters) found to plot against metrics. Skipping feature vs. metric scatter plots.")
@@ -63,77 +130,89 @@ class ScatterPlotComparison(ComparisonMethod):
         if not metrics_to_measure:
             print("  Warning: No metrics specified for scatter plots. Skipping feature vs. metric scatter plots.")
         
-        # Generate all combinations of (feature, metric)
+        # Generate all combinations of (feature, metric), skipping columns that
+        # are entirely NaN up front so degenerate pairs never reach the figure
+        # pipeline (common when a metric is unavailable for some models).
         # We also want to include metric vs metric plots if desired
-        plot_pairs = []
-        for feature in feature_cols:
-            for metric in metrics_to_measure:
-                plot_pairs.append((feature, metric))
-        
+        all_nan = {c for c in feature_cols + list(metrics_to_measure)
+                   if c in data.columns and data[c].isna().all()}
+        plot_pairs = [(feature, metric)
+                      for feature, metric in product(feature_cols, metrics_to_measure)
+                      if feature not in all_nan and metric not in all_nan]
+
         # Add a few useful metric vs metric plots as well (can be customized)
         # Ensure these are only added if both metrics exist
-        if 'total_duration_s' in metrics_to_measure and 'tokens_per_second' in metrics_to_measure:
-            plot_pairs.append(('total_duration_s', 'tokens_per_second'))
-        if 'response_length' in metrics_to_measure and 'quality_score' in metrics_to_measure:
-            plot_pairs.append(('response_length', 'quality_score'))
+        for x_var, y_var in (('total_duration_s', 'tokens_per_second'),
+                             ('response_length', 'quality_score')):
+            if (x_var in metrics_to_measure and y_var in metrics_to_measure
+                    and x_var not in all_nan and y_var not in all_nan):
+                plot_pairs.append((x_var, y_var))
 
         if not plot_pairs:
             print("  No suitable feature-metric or metric-metric pairs found for scatter plots.")
             return {"plots": {}}
 
+        # The combinations, palette, codes and legend handles are invariant
+        # across (x, y) pairs, so compute them once instead of per plot.
+        color_by_combo = 'param_combination' in data.columns and data['param_combination'].nunique() > 1
+        if color_by_combo:
+            codes_all, unique_combinations = pd.factorize(data['param_combination'].values)
+            # Cap the legend at the 20 most frequent combinations: hundreds of
+            # entries are unreadable and legend layout cost grows with artist
+            # count. Non-top combinations share a neutral gray, and the full
+            # list goes to a CSV sidecar.
+            vc = data['param_combination'].value_counts()
+            top = vc.head(20).index
+            top_pos = {combo: i for i, combo in enumerate(top)}
+            top_palette = cm.viridis(np.linspace(0, 1, len(top))) # Use a colormap
+            other_color = np.array([0.5, 0.5, 0.5, 1.0])
+            colors = np.array([top_palette[top_pos[c]] if c in top_pos else other_color
+                               for c in unique_combinations])
+            legend_combos = list(top)
+            legend_palette = list(top_palette)
+            if len(vc) > len(top):
+                legend_combos.append(f'other ({len(vc) - len(top)} more)')
+                legend_palette.append(other_color)
+                vc.rename_axis('param_combination').rename('count').to_csv(
+                    os.path.join(output_dir, 'param_combination_legend.csv'))
+        else:
+            legend_combos, legend_palette, colors = None, None, None
+
+        # One validity bitmap and one cached ndarray per plotted column; each
+        # pair then costs a SIMD AND over two bitmap columns plus two gathers,
+        # with no pandas objects left in the loop.
+        cols_needed = [c for c in dict.fromkeys(feature_cols + metrics_to_measure) if c in data.columns]
+        col_idx = {c: i for i, c in enumerate(cols_needed)}
+        valid = ~data[cols_needed].isna().to_numpy()
+        col_arrays = {c: data[c].to_numpy() for c in cols_needed}
+
+        # Build picklable (arrays, strings) tasks so rendering can fan out
+        # across processes when COMPARE_LLMS_PARALLEL=1.
+        tasks = []
         for x_var, y_var in plot_pairs:
             # Check if both variables exist in the DataFrame and are numeric
-            if x_var not in data.columns or y_var not in data.columns or \
-               not pd.api.types.is_numeric_dtype(data[x_var]) or not pd.api.types.is_numeric_dtype(data[y_var]):
+            if x_var not in num_cols or y_var not in num_cols:
                 print(f"  Skipping scatter plot for {x_var} vs {y_var}: One or both variables are missing or not numeric.")
                 continue
             
-            plot_data = data.dropna(subset=[x_var, y_var])
+            mask = valid[:, col_idx[x_var]] & valid[:, col_idx[y_var]]
 
-            if plot_data.empty:
+            if not mask.any():
                 print(f"  Skipping scatter plot for {x_var} vs {y_var}: No valid data after dropping NaNs.")
                 continue
 
-            fig, ax = plt.subplots(figsize=(10, 6))
-            
-            # Use param_combination for coloring if available and meaningful
-            # This allows seeing how different parameter sets cluster
-            if 'param_combination' in plot_data.columns and plot_data['param_combination'].nunique() > 1:
-                unique_combinations = plot_data['param_combination'].unique()
-                colors = plt.cm.viridis(np.linspace(0, 1, len(unique_combinations))) # Use a colormap
-                color_map = dict(zip(unique_combinations, colors))
-                plot_data['color'] = plot_data['param_combination'].map(color_map)
-                ax.scatter(plot_data[x_var], plot_data[y_var], c=plot_data['color'], alpha=0.7, s=50, edgecolor='none')
-                
-                # Add a legend for parameter combinations
-                legend_elements = [plt.Line2D([0], [0], marker='o', color='w', label=combo,
-                                              markerfacecolor=color_map[combo], markersize=10)
-                                   for combo in unique_combinations]
-                # Place legend outside to avoid overlap with plot
-                ax.legend(handles=legend_elements, title="Parameter Combo", bbox_to_anchor=(1.05, 1), loc='upper left', frameon=False, labelcolor='#CAC4D0', title_fontsize='medium')
-                plt.subplots_adjust(right=0.75) # Adjust layout to make space for legend
-            else:
-                # Default color if no parameter combinations to differentiate
-                ax.scatter(plot_data[x_var], plot_data[y_var], color='#D0BCFF', alpha=0.7, s=50, edgecolor='none') # M3 Primary color
-
-            ax.set_title(f'{x_var.replace("_", " ").title()} vs {y_var.replace("_", " ").title()}', color='#E6E1E5') # on_surface
-            ax.set_xlabel(x_var.replace("_", " ").title(), color='#CAC4D0') # on_surface_variant
-            ax.set_ylabel(y_var.replace("_", " ").title(), color='#CAC4D0') # on_surface_variant
-            
-            ax.tick_params(axis='x', colors='#938F99') # outline
-            ax.tick_params(axis='y', colors='#938F99') # outline
-            
-            ax.set_facecolor('#1C1B1F') # surface
-            fig.patch.set_facecolor('#1C1B1F') # background for the whole figure
+            xv = col_arrays[x_var][mask]
+            yv = col_arrays[y_var][mask]
 
-            ax.grid(True, linestyle='--', alpha=0.6, color='#49454F') # surface_variant for grid
+            # Gather each point's RGBA with one fancy-index over the hoisted
+            # palette; the positional mask aligns the cached codes so colors
+            # stay consistent across every plot.
+            point_colors = colors[codes_all[mask]] if color_by_combo else None
 
-            plt.tight_layout()
+            tasks.append((x_var, y_var, xv, yv, point_colors,
+                          legend_combos, legend_palette, output_dir))
 
-            plot_filename = os.path.join(output_dir, f"{x_var}_vs_{y_var}_scatterplot.png")
-            fig.savefig(plot_filename, facecolor=fig.get_facecolor())
-            plt.close(fig)
-            print(f"  Generated scatter plot for {x_var} vs {y_var}: {plot_filename}")
-            plots[f"Scatter Plot: {x_var.replace('_', ' ').title()} vs {y_var.replace('_', ' ').title()}"] = fig
+        for title, fig in render_all(_render_scatter, tasks):
+            plots[title] = fig
 
         return {"plots": plots}
\ No newline at end of file
@@ -1,8 +1,17 @@
 import pandas as pd
 from .base_comparison import ComparisonMethod
+from ._aggregation import grouped_mean
 import os
 import numpy as np
 
+_pyarrow_available = False
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    _pyarrow_available = True
+except ImportError:
+    print("Warning: pyarrow library not found. The aggregated table will be written with pandas' CSV writer. Install with 'pip install pyarrow'.")
+
 class TableComparison(ComparisonMethod):
     """Class for comparing LLM performance across different parameters and metrics by generating a summarized table.
 
@@ -50,7 +59,9 @@ class TableComparison(ComparisonMethod):
 
         if 'param_combination' not in data.columns:
             print("  Warning: 'param_combination' column not found in data. Table will not group by parameters.")
-            data['param_combination'] = 'default_params'
+            # assign() returns a shallow copy: the shared input frame stays
+            # untouched (compare() receives it read-only).
+            data = data.assign(param_combination='default_params')
         
         # Get individual feature columns that were added by main.py
         # These are the keys from the feature_params JSON.
@@ -67,18 +78,25 @@ class TableComparison(ComparisonMethod):
         group_cols = identifying_cols + llm_param_cols
         group_cols = sorted(list(set(group_cols))) # Ensure unique and sorted for consistent grouping
 
-        numeric_metrics = [
-            m for m in metrics_to_measure
-            if m in data.columns and pd.api.types.is_numeric_dtype(data[m])
-        ]
+        # One C-level dtype scan instead of an is_numeric_dtype probe per metric.
+        num_cols = set(data.select_dtypes(include=np.number).columns)
+        numeric_metrics = [m for m in metrics_to_measure if m in num_cols]
 
         if not numeric_metrics:
             print("  No numeric metrics found for TableComparison.")
             return {"aggregated_data": "No numeric metrics to aggregate."}
 
         # Aggregate data by the defined grouping columns
-        # We need to handle cases where there might be NaNs due to errors. mean() handles NaNs by default.
-        aggregated_data = data.groupby(group_cols)[numeric_metrics].mean().reset_index()
+        # We need to handle cases where there might be NaNs due to errors.
+        # Factorize the composite group key once and feed the shared NaN-aware
+        # kernel from _aggregation (JIT-compiled when numba is installed)
+        # instead of pandas' per-group machinery; first-seen key order matches
+        # the previous groupby(sort=False) behaviour.
+        codes, unique_keys = pd.factorize(pd.MultiIndex.from_frame(data[group_cols]))
+        means = grouped_mean(codes, data[numeric_metrics].to_numpy(dtype=np.float64), len(unique_keys))
+        aggregated_data = pd.concat(
+            [unique_keys.to_frame(index=False), pd.DataFrame(means, columns=numeric_metrics)],
+            axis=1)
 
         # Rename 'param_combination' for display if it's the only grouping column,
         # or just keep it as is if other feature columns are there.
@@ -86,22 +104,32 @@ class TableComparison(ComparisonMethod):
         if 'param_combination' in aggregated_data.columns:
              aggregated_data.rename(columns={'param_combination': 'Param Combination Label'}, inplace=True)
 
-        # Format numeric columns for better display
-        for col in numeric_metrics:
-            if col in aggregated_data.columns:
-                if col.endswith('_s'):
-                    aggregated_data[col] = aggregated_data[col].apply(lambda x: f"{x:.3f} s" if not pd.isna(x) else "N/A")
-                elif 'tokens' in col or col == 'response_length':
-                    aggregated_data[col] = aggregated_data[col].apply(lambda x: int(round(x)) if not pd.isna(x) else "N/A")
-                elif col == 'tokens_per_second':
-                    aggregated_data[col] = aggregated_data[col].apply(lambda x: f"{x:.2f}" if not pd.isna(x) else "N/A")
-                elif col == 'quality_score':
-                    aggregated_data[col] = aggregated_data[col].apply(lambda x: f"{x:.2f}" if not pd.isna(x) else "N/A")
-
+        # Write the CSV before the display formatting below so it keeps numeric
+        # dtypes for downstream consumers; pyarrow's multithreaded C++ writer
+        # is used when available, with pandas' writer as the fallback.
         output_csv_path = os.path.join(output_dir, "aggregated_metrics_table.csv")
-        aggregated_data.to_csv(output_csv_path, index=False)
+        if _pyarrow_available:
+            pacsv.write_csv(pa.Table.from_pandas(aggregated_data, preserve_index=False), output_csv_path)
+        else:
+            aggregated_data.to_csv(output_csv_path, index=False, lineterminator='\n')
         print(f"  Aggregated table saved to {output_csv_path}")
 
+        # Format numeric columns for better display. map with na_action='ignore'
+        # skips the per-element pd.isna probe the old apply lambdas paid, and a
+        # single fillna pass stamps the NaNs afterwards.
+        for col in numeric_metrics:
+            if col not in aggregated_data.columns:
+                continue
+            if col.endswith('_s'):
+                fmt = lambda x: f"{x:.3f} s"
+            elif 'tokens' in col or col == 'response_length':
+                fmt = lambda x: int(round(x))
+            elif col in ('tokens_per_second', 'quality_score'):
+                fmt = lambda x: f"{x:.2f}"
+            else:
+                continue
+            aggregated_data[col] = aggregated_data[col].map(fmt, na_action='ignore').fillna("N/A")
+
         return {
             "aggregated_data": aggregated_data
         }
\ No newline at end of file
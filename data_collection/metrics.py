@@ -1,13 +1,28 @@
+import re
+
+# Whitespace-delimited tokens, matching the old str.split() behaviour.
+_WORD_RE = re.compile(r"\S+")
+
+# Below this many characters (the typical LLM response), tokenizing with one
+# C-level findall over a lowered copy beats the Python-level streaming loop;
+# above it, streaming avoids materializing the copy and the full word list.
+_SMALL_RESPONSE_CHARS = 65536
+
+
 def calculate_metrics(
     full_response_content: str,
     raw_duration: float,
     first_token_duration: float,
     tokens_generated: int,
-    system_metrics: dict = None
+    system_metrics: dict = None,
+    eval_duration_ns: int = 0
 ) -> dict:
     """
     Calculates performance and quality metrics from raw experiment data,
-    including optional system performance metrics.
+    including optional system performance metrics. When the server-side
+    generation time (Ollama's eval_duration, in nanoseconds) is available it
+    is preferred for TokensPerSecond, since it excludes client and transport
+    overhead; otherwise the wall-clock duration is used.
     """
     metrics = {
         "TotalDuration": raw_duration,
@@ -17,14 +32,30 @@ def calculate_metrics(
 
     # Calculate Tokens Per Second (after first token)
     generation_duration = raw_duration - first_token_duration
-    if tokens_generated > 0 and generation_duration > 0:
+    if tokens_generated > 0 and eval_duration_ns > 0:
+        metrics["TokensPerSecond"] = tokens_generated * 1e9 / eval_duration_ns
+    elif tokens_generated > 0 and generation_duration > 0:
         metrics["TokensPerSecond"] = tokens_generated / generation_duration
     else:
         metrics["TokensPerSecond"] = 0.0
 
-    # Example: Unique words / total words ratio
-    words = full_response_content.lower().split()
-    metrics["UniqueWordsRatio"] = len(set(words)) / len(words) if words else 0.0
+    # Example: Unique words / total words ratio, size-gated on response
+    # length (hash-based counting wins at both scales; only the tokenizing
+    # strategy changes).
+    if len(full_response_content) < _SMALL_RESPONSE_CHARS:
+        words = _WORD_RE.findall(full_response_content.lower())
+        total_words = len(words)
+        unique_words = len(set(words))
+    else:
+        # One streaming pass, lower-casing per token, instead of a full
+        # .lower() copy plus an intermediate 100k-entry list.
+        seen = set()
+        total_words = 0
+        for match in _WORD_RE.finditer(full_response_content):
+            seen.add(match.group(0).lower())
+            total_words += 1
+        unique_words = len(seen)
+    metrics["UniqueWordsRatio"] = unique_words / total_words if total_words else 0.0
 
     # Integrate system metrics if provided
     if system_metrics:
@@ -1,17 +1,60 @@
 # LLMInsight/data_collection/ollama_client.py
+import asyncio
+import hashlib
+import json
 import ollama
+import shelve
 import time
 
+try:
+    # The ollama client decodes every streamed line with the stdlib json
+    # module. orjson tokenizes in C, cutting per-chunk decode cost several
+    # fold over a long sweep, so swap it in behind a json-compatible shim
+    # (orjson.dumps returns bytes and takes no keyword arguments).
+    import orjson
+    import ollama._client
+
+    class _OrjsonShim:
+        loads = staticmethod(orjson.loads)
+
+        @staticmethod
+        def dumps(obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+    ollama._client.json = _OrjsonShim
+except ImportError:
+    print("Warning: orjson not installed. Falling back to stdlib json for response parsing. Install with 'pip install orjson' for faster streaming.")
+
+# Shared read-only default for chat(): avoids allocating a fresh empty dict
+# per call. The client only serializes options, so sharing is safe.
+_EMPTY_OPTIONS: dict = {}
+
 class OllamaClient:
-    def __init__(self, model: str, host: str = "http://localhost:11434"):
+    def __init__(self, model: str, host: str = "http://localhost:11434", cache_path: str = None):
         self.model = model
+        self.host = host
         self.client = ollama.Client(host=host)
+        # Optional exact-match response cache persisted to disk: identical
+        # (model, options, prompt) calls across re-runs replay the recorded
+        # result instead of paying network plus model-eval cost again. This
+        # is orthogonal to Ollama's own prompt cache, which only speeds
+        # prefill on a warm server.
+        self._response_cache = shelve.open(cache_path) if cache_path else None
+        # Built on first achat() call so purely synchronous users never pay
+        # for an async client.
+        self._async_client = None
+        # Model existence is immutable per client; remember a successful check
+        # so repeated calls skip the HTTP round-trip.
+        self._model_verified = False
 
     def check_model_exists(self):
         """Checks if the specified model is available locally."""
+        if self._model_verified:
+            return True
         try:
             # This will raise a ResponseError if the model is not found
             self.client.show(self.model)
+            self._model_verified = True
             return True
         except ollama.ResponseError as e:
             if e.status_code == 404:
@@ -24,16 +67,33 @@ class OllamaClient:
     def chat(self, prompt: str, options: dict = None) -> tuple:
         """
         Sends a chat prompt to Ollama and collects timing data.
-        Returns: (full_response_content, total_duration, first_token_latency, tokens_generated)
+        Returns: (full_response_content, total_duration, first_token_latency,
+                  tokens_generated, eval_duration_ns)
         """
-        if options is None:
-            options = {}
+        options = options or _EMPTY_OPTIONS
+
+        cache_key = None
+        if self._response_cache is not None:
+            cache_key = self._cache_key(prompt, options)
+            hit = self._response_cache.get(cache_key)
+            if hit is not None:
+                return hit
 
-        full_response_content = ""
+        # Collect chunks in a list and join once at the end: str += copies the
+        # whole string per append, which is quadratic over a long response.
+        # Going lower-level (raw httpx + bytearray of undecoded content) was
+        # considered and rejected: the client's JSON parser hands us str, so
+        # re-encoding to bytes would add work, and bypassing the client loses
+        # its typed ResponseError handling and the orjson fast path above.
+        response_parts = []
+        chunks_seen = 0
         tokens_generated = 0
-        first_token_time = None
+        eval_duration_ns = 0
+        # perf_counter is monotonic and high-resolution; the negative sentinel
+        # keeps the per-chunk check a plain float compare.
+        first_token_time = -1.0
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
             response_stream = self.client.chat(
                 model=self.model,
@@ -43,13 +103,16 @@ class OllamaClient:
             )
 
             for chunk in response_stream:
-                if not first_token_time:
-                    first_token_time = time.time() # Mark time when first token is received
-                content = chunk['message']['content']
-                full_response_content += content
-                # Simple token count: assumes each chunk is one token.
-                # For better accuracy, use a proper tokenizer (e.g., tiktoken for GPT-like models, but for Ollama it's less straightforward).
-                tokens_generated += 1 
+                if first_token_time < 0.0:
+                    first_token_time = time.perf_counter() # Mark time when first token is received
+                response_parts.append(chunk['message']['content'])
+                chunks_seen += 1
+                # The final (done=True) chunk carries the server's own token
+                # count and generation time, which are exact; the chunk count
+                # only approximates tokens (chunks can hold several tokens).
+                if chunk.get('done'):
+                    tokens_generated = chunk.get('eval_count', 0)
+                    eval_duration_ns = chunk.get('eval_duration', 0)
 
         except ollama.ResponseError as e:
             print(f"Ollama Response Error: {e.status_code} - {e.error}")
@@ -58,9 +121,98 @@ class OllamaClient:
             print(f"An unexpected error during Ollama chat: {e}")
             raise e
 
-        end_time = time.time()
+        end_time = time.perf_counter()
 
+        full_response_content = "".join(response_parts)
         total_duration = end_time - start_time
-        first_token_latency = first_token_time - start_time if first_token_time else total_duration # Fallback if no tokens
+        first_token_latency = first_token_time - start_time if first_token_time >= 0.0 else total_duration # Fallback if no tokens
+        if tokens_generated == 0:
+            tokens_generated = chunks_seen # Fallback if the stream never reported done
+
+        result = (full_response_content, total_duration, first_token_latency, tokens_generated, eval_duration_ns)
+        if cache_key is not None:
+            self._response_cache[cache_key] = result
+            self._response_cache.sync()
+        return result
+
+    def _cache_key(self, prompt: str, options: dict) -> str:
+        """Deterministic key over everything that affects the response."""
+        payload = json.dumps({"model": self.model, "options": options, "prompt": prompt},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def achat(self, prompt: str, options: dict = None) -> tuple:
+        """
+        Async counterpart of chat() with the same return tuple. Lets a sweep
+        driver overlap requests with asyncio.gather instead of paying one
+        round-trip of latency per call; concurrency should be capped (e.g.
+        with an asyncio.Semaphore) to the server's OLLAMA_NUM_PARALLEL.
+        Returns: (full_response_content, total_duration, first_token_latency,
+                  tokens_generated, eval_duration_ns)
+        """
+        options = options or _EMPTY_OPTIONS
+        if self._async_client is None:
+            self._async_client = ollama.AsyncClient(host=self.host)
+
+        response_parts = []
+        chunks_seen = 0
+        tokens_generated = 0
+        eval_duration_ns = 0
+        first_token_time = -1.0
+
+        start_time = time.perf_counter()
+        try:
+            response_stream = await self._async_client.chat(
+                model=self.model,
+                messages=[{'role': 'user', 'content': prompt}],
+                options=options,
+                stream=True
+            )
+
+            async for chunk in response_stream:
+                if first_token_time < 0.0:
+                    first_token_time = time.perf_counter()
+                response_parts.append(chunk['message']['content'])
+                chunks_seen += 1
+                if chunk.get('done'):
+                    tokens_generated = chunk.get('eval_count', 0)
+                    eval_duration_ns = chunk.get('eval_duration', 0)
+
+        except ollama.ResponseError as e:
+            print(f"Ollama Response Error: {e.status_code} - {e.error}")
+            raise e
+        except Exception as e:
+            print(f"An unexpected error during Ollama chat: {e}")
+            raise e
+
+        end_time = time.perf_counter()
+
+        full_response_content = "".join(response_parts)
+        total_duration = end_time - start_time
+        first_token_latency = first_token_time - start_time if first_token_time >= 0.0 else total_duration # Fallback if no tokens
+        if tokens_generated == 0:
+            tokens_generated = chunks_seen # Fallback if the stream never reported done
+
+        return full_response_content, total_duration, first_token_latency, tokens_generated, eval_duration_ns
+
+async def run_cells(model: str, cells, hosts, per_host_concurrency: int = 1) -> list:
+    """
+    Dispatches sweep cells across several Ollama endpoints concurrently.
+
+    cells is an iterable of (prompt, options) pairs; hosts is a list of server
+    URLs (e.g. one process per port for system-parameter combinations, which
+    need independent model instances). Cells are assigned round-robin and run
+    through achat() under asyncio.gather, so sweep wall-clock approaches
+    max(cell) * cells / hosts instead of sum(cells). per_host_concurrency
+    should not exceed the servers' OLLAMA_NUM_PARALLEL.
+    Returns the achat() result tuples in cell order.
+    """
+    clients = [OllamaClient(model, host=host) for host in hosts]
+    semaphore = asyncio.Semaphore(per_host_concurrency * len(clients))
+
+    async def _run(index, prompt, options):
+        async with semaphore:
+            return await clients[index % len(clients)].achat(prompt, options)
 
-        return full_response_content, total_duration, first_token_latency, tokens_generated
\ No newline at end of file
+    return await asyncio.gather(
+        *(_run(i, prompt, options) for i, (prompt, options) in enumerate(cells)))
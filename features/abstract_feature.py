@@ -1,5 +1,6 @@
 # LLMInsight/features/abstract_feature.py
-from abc import ABC, abstractmethod
+from abc import ABC
+from typing import ClassVar
 
 class LLMFeature(ABC):
     """Abstract base class representing an LLM (Large Language Model) feature.
@@ -16,9 +17,49 @@ class LLMFeature(ABC):
         Returns the Ollama API option name associated with this feature.
         This is used in the configuration files and API requests.
 
-    - get_test_values() -> list:
-        Provides a set of values to be tested for this LLM feature.
-        These values are useful for validation and testing purposes."""
+    - get_test_values() -> tuple:
+        Provides the values to be tested for this LLM feature.
+        These values are useful for validation and testing purposes.
+
+    Subclasses declare the parameter name and test values as the class-level
+    constants OLLAMA_PARAM_NAME and TEST_VALUES instead of overriding the
+    accessor methods; a constant attribute lookup is one dict probe with no
+    frame setup, and the tuple is built once at class definition rather than
+    a fresh list per call. The get_* methods remain as thin wrappers so
+    existing callers keep working.
+
+    The class declares __slots__, so instances carry no per-object __dict__:
+    experiments build one instance per feature per run, and slotted attribute
+    access is both smaller and faster. Subclasses that add no attributes of
+    their own must declare `__slots__ = ()` to keep that benefit."""
+
+    __slots__ = ("name", "description", "param_type")
+
+    # Overridden per subclass; the empty defaults mark a feature that has not
+    # declared its Ollama parameter contract yet. DEFAULT_VALUE is the
+    # server-side default (usually the "disabled" sentinel), used to omit
+    # no-op entries from request payloads.
+    OLLAMA_PARAM_NAME: ClassVar[str] = ""
+    TEST_VALUES: ClassVar[tuple] = ()
+    DEFAULT_VALUE: ClassVar = None
+    # True for parameters that only take effect through a Modelfile rebuild
+    # or model reload (seconds to minutes each). Sweep drivers should sort
+    # cells so every run sharing a reload-requiring combination executes
+    # back-to-back, paying the reload once per unique combination instead of
+    # once per cell.
+    requires_model_reload: ClassVar[bool] = False
+
+    # One interned instance per concrete class: the objects are pure value
+    # holders, so Temperature() is Temperature() and sweep loops that
+    # construct features per cell allocate nothing after the first call.
+    _instances: ClassVar[dict] = {}
+
+    def __new__(cls, *args, **kwargs):
+        inst = cls._instances.get(cls)
+        if inst is None:
+            inst = cls._instances.setdefault(cls, super().__new__(cls))
+        return inst
+
     def __init__(self, name: str, description: str, param_type: str):
         """Initialize the instance with the provided parameters.
 
@@ -30,13 +71,39 @@ class LLMFeature(ABC):
         self.description = description
         self.param_type = param_type # e.g., "generation", "system"
 
-    @abstractmethod
     def get_ollama_param_name(self) -> str:
         """Returns the parameter name used in Ollama API options (e.g., 'temperature')
            or the Modelfile parameter name (e.g., 'num_gpu')."""
-        pass
+        return self.OLLAMA_PARAM_NAME
+
+    def get_test_values(self) -> tuple:
+        """Returns the values to test for this feature. The shared TEST_VALUES
+           tuple is handed back as-is: no per-call list allocation, and
+           callers cannot accidentally mutate another caller's copy."""
+        return self.TEST_VALUES
+
+
+def _feature_init(self, _name, _description, _param_type):
+    """Shared __init__ for all table-built features."""
+    LLMFeature.__init__(self, _name, _description, _param_type)
+
+
+def make_feature(name, ollama_param, description, test_values,
+                 param_type="generation", requires_model_reload=False):
+    """Builds one concrete LLMFeature subclass from its constants.
 
-    @abstractmethod
-    def get_test_values(self) -> list:
-        """Returns a list of values to test for this feature."""
-        pass
\ No newline at end of file
+    The feature modules declare their parameters as table rows and generate
+    the classes through this factory, sharing a single __init__ code object
+    instead of one near-identical method body per class. Default-argument
+    binding keeps each generated class's constants early-bound."""
+    return type(name, (LLMFeature,), {
+        '__slots__': (),
+        '__doc__': description,
+        'OLLAMA_PARAM_NAME': ollama_param,
+        'TEST_VALUES': test_values,
+        # By convention the first test value is the disabled/default setting.
+        'DEFAULT_VALUE': test_values[0],
+        'requires_model_reload': requires_model_reload,
+        '__init__': lambda self, _n=name, _d=description, _t=param_type:
+            _feature_init(self, _n, _d, _t),
+    })
\ No newline at end of file
@@ -1,9 +1,45 @@
 # system_monitor/base_metric_collector.py
 from abc import ABC, abstractmethod
+import array
+import logging
 import time
 import threading
-import pandas as pd
-import numpy as np # For potential NaN handling if needed in summary
+import numpy as np
+
+# Start/stop chatter sits at DEBUG and collection failures at ERROR, so the
+# samplers stay silent on the default INFO level instead of flushing a line
+# per lifecycle event into the timed region.
+log = logging.getLogger("compare_llms.system_monitor")
+
+_numba_available = False
+try:
+    import numba
+    _numba_available = True
+except ImportError:
+    print("Warning: numba library not found. Collector summaries will use the NumPy fallback. Install with 'pip install numba'.")
+
+
+if _numba_available:
+    @numba.njit(cache=True, fastmath=True)
+    def _mean_max(values):
+        """Mean and max of a float64 column in one fused pass.
+
+        At sub-100ms sampling intervals a long generation collects 10^4+
+        samples per metric; one tight loop beats separate .mean() and .max()
+        reductions (two passes) and runs without the GIL, so it does not
+        stall the sampler threads it summarizes."""
+        total = 0.0
+        hi = -np.inf
+        for i in range(values.shape[0]):
+            v = values[i]
+            total += v
+            if v > hi:
+                hi = v
+        return total / values.shape[0], hi
+else:
+    def _mean_max(values):
+        """NumPy fallback: two C-level passes instead of one fused loop."""
+        return values.mean(), values.max()
 
 class BaseMetricCollector(ABC):
     """Abstract base class for collecting and summarizing metrics.
@@ -13,7 +49,8 @@ class BaseMetricCollector(ABC):
         interval (float, optional): The sampling interval in seconds.
 
     Attributes:
-        _data_points (list[dict]): Stores raw data points collected during a run.
+        _columns (dict[str, array.array]): Per-metric sample arrays collected
+            during a run (column-oriented; all columns share one row order).
         _is_running (bool): Indicates if the collection thread is running.
         _thread (Thread, None): The background thread that performs data collection.
         _stop_event (Event): Event to signal the thread to stop.
@@ -29,8 +66,8 @@ class BaseMetricCollector(ABC):
         start(self):
             Starts the continuous data collection in a separate thread.
 
-        stop(self) -> list[dict]:
-            Stops the data collection thread and returns all collected raw data points.
+        stop(self) -> dict:
+            Stops the data collection thread and returns the raw sample arrays.
 
         get_summary(self) -> dict:
             Processes the collected raw data points and returns a summary."""
@@ -44,7 +81,17 @@ class BaseMetricCollector(ABC):
         """
         self.name = name
         self.interval = interval
-        self._data_points = []  # Stores raw data points collected during a run
+        # Adaptive-polling state: subclasses may report a stability
+        # signature per sample via _adapt_interval(), which backs the
+        # effective interval off while the signature holds steady.
+        self._base_interval = interval
+        self._stable_count = 0
+        self._last_signature = None
+        # Samples are stored column-oriented: one compact array.array('d') of
+        # float64 per metric instead of a list of per-sample dicts. Summaries
+        # then reduce each column with NumPy directly - no DataFrame
+        # construction, type inference, or per-row dict allocation.
+        self._columns = {}
         self._is_running = False
         self._thread = None
         self._stop_event = threading.Event() # Event to signal the thread to stop
@@ -58,67 +105,141 @@ class BaseMetricCollector(ABC):
         pass
 
     def _run_collection(self):
-        """Internal method to run data collection in a separate thread."""
+        """Internal method to run data collection in a separate thread.
+
+        Samples are scheduled against a monotonic deadline rather than
+        sleeping a fixed interval after each collection: the collection
+        itself takes variable time, and adding the interval on top of it
+        made samples drift and cluster, skewing the *_eval_max summaries.
+        """
+        next_deadline = time.monotonic()
         while not self._stop_event.is_set():
             try:
                 data_point = self._collect_data_point()
                 if data_point:
                     data_point['timestamp'] = time.time() # Add a timestamp for each sample
-                    self._data_points.append(data_point)
+                    columns = self._columns
+                    for key, value in data_point.items():
+                        col = columns.get(key)
+                        if col is None:
+                            col = columns[key] = array.array('d')
+                        col.append(value)
             except Exception as e:
-                print(f"Error collecting {self.name} data: {e}")
+                log.error(f"Error collecting {self.name} data: {e}")
             finally:
-                # Sleep for the interval, but allow the stop event to interrupt quickly
-                self._stop_event.wait(self.interval)
+                # Wait until the next deadline, but allow the stop event to
+                # interrupt quickly; on overrun, re-anchor instead of rushing
+                # a burst of catch-up samples.
+                next_deadline += self.interval
+                delay = next_deadline - time.monotonic()
+                if delay > 0:
+                    self._stop_event.wait(delay)
+                else:
+                    next_deadline = time.monotonic()
+
+    def _adapt_interval(self, signature: tuple, epsilon: float = 1.0,
+                        max_doublings: int = 4):
+        """
+        Backs the sampling interval off while the given stability signature
+        holds steady, and snaps back to the base interval on change.
+
+        Polling a quiet system at the base rate burns syscalls and NVML
+        round-trips for samples that repeat the previous value. Each
+        consecutive sample whose signature stays within epsilon of the last
+        doubles the effective interval, capped at 2**max_doublings times the
+        base; the first sample outside epsilon resets it. The scheduler in
+        _run_collection reads self.interval per tick, so the change takes
+        effect on the next deadline. A NaN anywhere in the signature counts
+        as a change, so error-filled samples never slow the poller down.
+        """
+        prev = self._last_signature
+        self._last_signature = signature
+        if prev is not None and len(prev) == len(signature) and all(
+                abs(a - b) <= epsilon for a, b in zip(signature, prev)):
+            self._stable_count += 1
+        else:
+            self._stable_count = 0
+        self.interval = self._base_interval * 2 ** min(self._stable_count,
+                                                       max_doublings)
 
     def start(self):
         """Starts the continuous data collection in a separate thread."""
         if self._is_running:
-            print(f"  {self.name} collector is already running.")
+            log.debug(f"  {self.name} collector is already running.")
             return
 
-        self._data_points = []  # Clear previous data points for a new collection run
+        self._columns = {}  # Clear previous data points for a new collection run
+        self.interval = self._base_interval  # Undo any adaptive backoff
+        self._stable_count = 0
+        self._last_signature = None
         self._stop_event.clear() # Clear the stop signal
         self._thread = threading.Thread(target=self._run_collection, daemon=True) # Daemon thread exits with main program
         self._thread.start()
         self._is_running = True
-        print(f"  {self.name} collector started.")
+        log.debug(f"  {self.name} collector started.")
 
-    def stop(self) -> list[dict]:
+    def stop(self) -> dict:
         """
-        Stops the data collection thread and returns all raw collected data points.
+        Stops the data collection thread and returns the raw per-metric
+        sample arrays.
         """
         if not self._is_running:
-            print(f"  {self.name} collector is not running.")
-            return []
+            log.debug(f"  {self.name} collector is not running.")
+            return {}
 
         self._stop_event.set() # Signal the thread to stop
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=self.interval * 2 + 1) # Wait for thread to finish, with a timeout
             if self._thread.is_alive():
-                print(f"  Warning: {self.name} collector thread did not stop gracefully.")
-        
+                log.warning(f"  {self.name} collector thread did not stop gracefully.")
+
         self._is_running = False
-        print(f"  {self.name} collector stopped. Collected {len(self._data_points)} data points.")
-        return self._data_points
+        log.debug(f"  {self.name} collector stopped. Collected {self.mark()} data points.")
+        return self._columns
 
-    def get_summary(self) -> dict:
+    def mark(self) -> int:
         """
-        Processes the collected raw data points and returns a summary.
-        This method can be overridden by subclasses for more specific summaries.
+        Returns the current sample count. Together with slice(), this windows
+        the sample stream around one measured region without stopping the
+        sampler thread: callers that previously paid a thread start()/join()
+        per measurement now take two list-length reads instead.
         """
-        if not self._data_points:
-            return {}
+        timestamps = self._columns.get('timestamp')
+        return len(timestamps) if timestamps is not None else 0
 
-        df = pd.DataFrame(self._data_points)
+    def slice(self, start_idx: int) -> dict:
+        """
+        Returns the per-metric samples collected since the given mark() value,
+        as a dict of column slices.
+        """
+        return {key: col[start_idx:] for key, col in self._columns.items()}
+
+    @classmethod
+    def get_summary_from(cls, columns: dict) -> dict:
+        """
+        Summarizes a dict of per-metric sample arrays (e.g. a mark()/slice()
+        window) without touching collector state.
+        """
         summary = {}
+        for key, col in columns.items():
+            if key == 'timestamp' or len(col) == 0:
+                continue
+            # array.array exposes the buffer protocol, so this wraps the
+            # samples without copying and reduces them in one pass
+            # (JIT-compiled when numba is installed).
+            values = np.frombuffer(col, dtype=np.float64)
+            mean, peak = _mean_max(values)
+            # Add '_eval_avg' and '_eval_max' suffix to distinguish from LLM metrics
+            summary[f"{key}_eval_avg"] = mean
+            summary[f"{key}_eval_max"] = peak
+            # Consider adding other stats like min, p90, std dev if useful for analysis
+            # summary[f"{key}_eval_min"] = values.min()
+            # summary[f"{key}_eval_p90"] = np.quantile(values, 0.9)
+        return summary
 
-        for col in df.columns:
-            if col != 'timestamp' and pd.api.types.is_numeric_dtype(df[col]):
-                # Add '_eval_avg' and '_eval_max' suffix to distinguish from LLM metrics
-                summary[f"{col}_eval_avg"] = df[col].mean()
-                summary[f"{col}_eval_max"] = df[col].max()
-                # Consider adding other stats like min, p90, std dev if useful for analysis
-                # summary[f"{col}_eval_min"] = df[col].min()
-                # summary[f"{col}_eval_p90"] = df[col].quantile(0.9)
-        return summary
\ No newline at end of file
+    def get_summary(self) -> dict:
+        """
+        Processes the collected raw data points and returns a summary.
+        This method can be overridden by subclasses for more specific summaries.
+        """
+        return self.get_summary_from(self._columns)
\ No newline at end of file
@@ -1,7 +1,14 @@
 # system_monitor/cpu_collector.py
+import os
 import psutil
 from .base_metric_collector import BaseMetricCollector
 
+# On Linux the sampler reads /proc/stat directly instead of going through
+# psutil's per-CPU-times plumbing: one seek/read/split per sample versus a
+# pile of syscalls and object allocations. Cheaper samples perturb the
+# workload being measured less and make shorter intervals safe.
+_PROC_STAT = '/proc/stat' if os.path.exists('/proc/stat') else None
+
 class CPUCollector(BaseMetricCollector):
     """This class collects CPU-related metrics, including CPU usage, system-wide load averages,
     and optionally CPU temperatures. It uses the `psutil` library to retrieve these statistics.
@@ -22,8 +29,31 @@ class CPUCollector(BaseMetricCollector):
     Initializes the parent class 'CPU Monitor' with its name and the specified interval,
     and ensures that psutil can make non-blocking calls to retrieve the CPU percentage."""
         super().__init__("CPU Monitor", interval)
-        # Prime psutil for non-blocking cpu_percent calls
-        psutil.cpu_percent(interval=None) 
+        # psutil.cpu_count re-scans topology on every call; the core count
+        # cannot change mid-run, so cache it once for the load normalization.
+        self._ncpu = psutil.cpu_count(logical=True)
+        self._statf = None
+        if _PROC_STAT is not None:
+            try:
+                self._statf = open(_PROC_STAT, 'rb')
+                # Seed the previous counters so the first sample's delta
+                # covers init-to-first-sample rather than boot-to-now.
+                self._prev_total, self._prev_idle = self._read_proc_stat()
+            except OSError:
+                self._statf = None
+        if self._statf is None:
+            # Prime psutil for non-blocking cpu_percent calls
+            psutil.cpu_percent(interval=None)
+
+    def _read_proc_stat(self) -> tuple:
+        """Reads the aggregate cpu line of /proc/stat and returns
+        (total_jiffies, idle_jiffies), counting iowait as idle the way
+        psutil does."""
+        self._statf.seek(0)
+        # user nice system idle iowait irq softirq steal
+        fields = self._statf.read(128).split(b'\n', 1)[0].split()
+        values = [int(v) for v in fields[1:9]]
+        return sum(values), values[3] + values[4]
 
     def _collect_data_point(self) -> dict:
         """Collect and return a dictionary containing system resource metrics.
@@ -35,14 +65,23 @@ class CPUCollector(BaseMetricCollector):
         - 'load_avg_15min_normalized': Load average for the past fifteen minutes normalized by the number of CPU cores.
 
     Note: This function may not be available or return CPU temperature on all systems. For more detailed data, consider using additional libraries or APIs."""
-        data = {
-            "cpu_percent": psutil.cpu_percent(interval=None) # Non-blocking call for current usage since last call
-        }
+        if self._statf is not None:
+            # Busy fraction from counter deltas since the previous sample.
+            total, idle = self._read_proc_stat()
+            total_delta = total - self._prev_total
+            idle_delta = idle - self._prev_idle
+            self._prev_total, self._prev_idle = total, idle
+            busy = 100.0 * (total_delta - idle_delta) / total_delta if total_delta > 0 else 0.0
+            data = {"cpu_percent": busy}
+        else:
+            data = {
+                "cpu_percent": psutil.cpu_percent(interval=None) # Non-blocking call for current usage since last call
+            }
         # Load average is system-wide and typically for 1, 5, 15 minutes
         load_avg = psutil.getloadavg()
         if load_avg:
             # Normalize load average by number of CPU cores for a more comparable metric
-            num_cores = psutil.cpu_count(logical=True)
+            num_cores = self._ncpu
             data["load_avg_1min_normalized"] = load_avg[0] / num_cores
             data["load_avg_5min_normalized"] = load_avg[1] / num_cores
             data["load_avg_15min_normalized"] = load_avg[2] / num_cores
@@ -58,5 +97,8 @@ class CPUCollector(BaseMetricCollector):
         #     cpu_temps = [t.current for t in temps['cpu_thermal']]
         #     data["cpu_temp_celsius_avg"] = sum(cpu_temps) / len(cpu_temps) if cpu_temps else np.nan
         #     data["cpu_temp_celsius_max"] = max(cpu_temps) if cpu_temps else np.nan
-        
+
+        # Back the poller off while CPU usage is flat within 1%; an active
+        # workload moves it well past that and snaps the rate back.
+        self._adapt_interval((data["cpu_percent"],))
         return data
\ No newline at end of file
@@ -1,17 +1,82 @@
 # system_monitor/gpu_collector.py
 from .base_metric_collector import BaseMetricCollector
-import numpy as np
+import logging
+import time
+
+log = logging.getLogger("compare_llms.system_monitor")
+
+# The only thing this module needed NumPy for was the NaN fill value; a
+# plain float NaN is indistinguishable once it lands in the sample columns
+# and resolves as a local/module constant instead of a module attribute
+# lookup per assignment.
+_NAN = float('nan')
+
+# How long to leave a failing device alone before probing it again. A GPU
+# that threw NVMLError (driver unload, MIG reconfigure, fell off the bus)
+# tends to keep throwing; retrying it every sample costs four failing NVML
+# calls plus an error line per tick.
+_DEAD_COOLDOWN_S = 30.0
 
 _pynvml_available = False
+# Filled in by the nested import below on pynvml releases that ship the
+# batched field-value API; None keeps older releases on the per-getter path.
+nvmlDeviceGetFieldValues = None
+NVML_FI_DEV_POWER_INSTANT = None
 try:
-    from pynvml.nvml import *  # Import all NVML constants and functions
+    # Explicit imports instead of the old star import: the collector only
+    # touches a handful of NVML entry points, and pulling in the several
+    # hundred names pynvml exports slowed module import and invited
+    # accidental shadowing.
+    from pynvml.nvml import (
+        NVMLError,
+        NVML_TEMP_GPU,
+        nvmlDeviceGetCount,
+        nvmlDeviceGetHandleByIndex,
+        nvmlDeviceGetMemoryInfo,
+        nvmlDeviceGetPowerUsage,
+        nvmlDeviceGetTemperature,
+        nvmlDeviceGetUtilizationRates,
+        nvmlInit,
+        nvmlShutdown,
+    )
     _pynvml_available = True
+    try:
+        from pynvml.nvml import (nvmlDeviceGetFieldValues,
+                                 NVML_FI_DEV_POWER_INSTANT)
+    except ImportError:
+        pass
 except ImportError:
     print("Warning: pynvml library not found. GPU metrics will not be collected. Install with 'pip install pynvml'.")
 except Exception as error:
     print(f"Warning: NVML initialization failed or not found ({error}). GPU metrics will not be collected. Ensure NVIDIA drivers are installed and NVML is accessible.")
 
 
+def _field_as_float(field_value) -> float:
+    """Extracts a field-value union member as float, keyed on its valueType.
+
+    NVML value-type codes: 0 double, 1 unsigned int, 2 unsigned long,
+    3 unsigned long long, 4 signed long long, 5 signed int."""
+    value = field_value.value
+    value_type = field_value.valueType
+    if value_type == 0:
+        return float(value.dVal)
+    if value_type == 1:
+        return float(value.uiVal)
+    if value_type == 2:
+        return float(value.ulVal)
+    if value_type == 3:
+        return float(value.ullVal)
+    if value_type == 4:
+        return float(value.sllVal)
+    return float(value.siVal)
+
+
+# Reciprocal of bytes-per-GB, computed once: the sample loop multiplies by
+# this instead of dividing, and float multiply is several times cheaper than
+# divide on current cores.
+_INV_GB = 1.0 / (1024**3)
+
+
 class GPUCollector(BaseMetricCollector):
     """A class for collecting GPU metrics using the PyNVML library. This collector queries NVIDIA GPUs to retrieve utilization, memory usage,
     temperature, and power consumption data at a specified interval.
@@ -44,6 +109,18 @@ class GPUCollector(BaseMetricCollector):
 
         super().__init__("GPU Monitor", interval)
         self._gpu_count = 0
+        # Device handles are looked up once here: nvmlDeviceGetHandleByIndex
+        # goes through dlsym and version checks, and repeating it per GPU per
+        # sample dominates user-space CPU in polling NVML clients. A handle
+        # stays valid for the life of the NVML session, so caching is safe.
+        self._handles = []
+        self._power_supported = []
+        self._batch_fields = []
+        self._keys = []
+        self._mem_total_gb = []
+        # Per-device cooldown deadline (time.monotonic); nonzero means the
+        # device failed recently and is skipped until the deadline passes.
+        self._dead_until = []
 
         if _pynvml_available:
             try:
@@ -51,6 +128,64 @@ class GPUCollector(BaseMetricCollector):
                 self._gpu_count = nvmlDeviceGetCount()
                 if self._gpu_count > 0:
                     print(f"  Detected {self._gpu_count} NVIDIA GPU(s).")
+                    self._handles = [nvmlDeviceGetHandleByIndex(i)
+                                     for i in range(self._gpu_count)]
+                    # Metric key names are fixed per device, so format them
+                    # once here rather than building seven f-strings per GPU
+                    # on every sample.
+                    self._keys = [(f"gpu_{i}_utilization_percent",
+                                   f"gpu_{i}_memory_utilization_percent",
+                                   f"gpu_{i}_memory_used_gb",
+                                   f"gpu_{i}_memory_total_gb",
+                                   f"gpu_{i}_memory_free_gb",
+                                   f"gpu_{i}_temperature_celsius",
+                                   f"gpu_{i}_power_watts")
+                                  for i in range(self._gpu_count)]
+                    self._dead_until = [0.0] * self._gpu_count
+                    if self._gpu_count == 1:
+                        # Most dev boxes have one GPU; the specialized
+                        # sampler skips the device loop entirely.
+                        self._collect_data_point = self._collect_single
+                    # Total framebuffer memory is fixed for the life of the
+                    # run, so read it once here instead of pulling it out of
+                    # the memory-info struct on every sample.
+                    self._mem_total_gb = []
+                    for handle in self._handles:
+                        try:
+                            self._mem_total_gb.append(
+                                nvmlDeviceGetMemoryInfo(handle).total * _INV_GB)
+                        except NVMLError:
+                            self._mem_total_gb.append(_NAN)
+                    # Trial-call power telemetry once per device: cards
+                    # without it raise NVMLError on every query, and paying
+                    # that exception per sample is pure waste.
+                    self._power_supported = []
+                    for handle in self._handles:
+                        try:
+                            nvmlDeviceGetPowerUsage(handle)
+                            self._power_supported.append(True)
+                        except NVMLError:
+                            self._power_supported.append(False)
+                    # Prefer NVML's batched field-value API where the
+                    # bindings expose it: one call can carry several field
+                    # reads, each a user-to-kernel transition saved. NVML's
+                    # field table only covers power for the metrics sampled
+                    # here (utilization, framebuffer memory and core
+                    # temperature are not field-addressable), so the struct
+                    # getters - which already bundle several values per
+                    # call - remain for the rest. The names import as None
+                    # on pynvml releases that lack the function and the
+                    # field constant.
+                    if (nvmlDeviceGetFieldValues is not None
+                            and NVML_FI_DEV_POWER_INSTANT is not None
+                            and self._power_supported[0]):
+                        try:
+                            trial = nvmlDeviceGetFieldValues(
+                                self._handles[0], [NVML_FI_DEV_POWER_INSTANT])
+                            if trial and trial[0].nvmlReturn == 0:
+                                self._batch_fields = [NVML_FI_DEV_POWER_INSTANT]
+                        except (NVMLError, TypeError):
+                            pass
                 else:
                     print("  No NVIDIA GPUs detected.")
                     _pynvml_available = False
@@ -58,7 +193,58 @@ class GPUCollector(BaseMetricCollector):
                 print(f"Warning: NVML initialization or device count failed: {error}. GPU metrics will not be collected.")
                 _pynvml_available = False
 
-    def _collect_data_point(self) -> dict:
+    def _collect_single(self) -> dict:
+        """Specialized sampler for the single-GPU case (bound over
+        _collect_data_point in __init__ when exactly one device is present).
+
+        Same behavior as _collect_multi with the device loop and index
+        arithmetic peeled away - see that method for the commentary on
+        cooldown handling, batched power reads and adaptive polling."""
+        if not _pynvml_available:
+            return {}
+
+        now = time.monotonic()
+        keys = self._keys[0]
+
+        if now < self._dead_until[0]:
+            gpu_data = dict.fromkeys(keys, _NAN)
+        else:
+            gpu_data = {}
+            try:
+                if self._dead_until[0]:
+                    self._handles[0] = nvmlDeviceGetHandleByIndex(0)
+                    self._mem_total_gb[0] = (
+                        nvmlDeviceGetMemoryInfo(self._handles[0]).total * _INV_GB)
+                    self._dead_until[0] = 0.0
+                handle = self._handles[0]
+
+                utilization = nvmlDeviceGetUtilizationRates(handle)
+                mem_info = nvmlDeviceGetMemoryInfo(handle)
+                temperature = nvmlDeviceGetTemperature(handle, NVML_TEMP_GPU)
+
+                values = (utilization.gpu, utilization.memory,
+                          mem_info.used * _INV_GB, self._mem_total_gb[0],
+                          mem_info.free * _INV_GB, temperature)
+
+                if self._batch_fields:
+                    field_values = nvmlDeviceGetFieldValues(handle, self._batch_fields)
+                    if field_values[0].nvmlReturn == 0:
+                        values += (_field_as_float(field_values[0]) * 1e-3,)  # Convert mW to W
+                elif self._power_supported[0]:
+                    values += (nvmlDeviceGetPowerUsage(handle) * 1e-3,)  # Convert mW to W
+
+                gpu_data.update(zip(keys, values))
+
+            except NVMLError as error:
+                log.warning(f"Error collecting data for GPU 0: {error}. Skipping this GPU for {_DEAD_COOLDOWN_S:.0f}s.")
+                self._dead_until[0] = now + _DEAD_COOLDOWN_S
+                gpu_data = dict.fromkeys(keys, _NAN)
+
+        self._adapt_interval((gpu_data.get(keys[0], _NAN),
+                              gpu_data.get(keys[6], 0.0)))
+        return gpu_data
+
+    def _collect_multi(self) -> dict:
         """Collects data points for GPU metrics such as utilization, memory usage, temperature, and power consumption.
 
     This function retrieves information from NVIDIA Management Library (NVML) to gather details about each GPU in the system.
@@ -72,52 +258,103 @@ class GPUCollector(BaseMetricCollector):
             return {}
 
         gpu_data = {}
-        gb_divisor = 1024**3  # Convert bytes to GB
+        now = time.monotonic()
+
+        # Hoist the NVML entry points and per-device state into locals:
+        # inside the loop each use is then a LOAD_FAST instead of a
+        # LOAD_GLOBAL or self-attribute lookup, which adds up across
+        # devices at sub-second sampling rates. (_collect_single touches
+        # each name once, so it gains nothing from aliases.)
+        get_util = nvmlDeviceGetUtilizationRates
+        get_mem = nvmlDeviceGetMemoryInfo
+        get_temp = nvmlDeviceGetTemperature
+        all_keys = self._keys
+        handles = self._handles
+        dead_until = self._dead_until
+        mem_total_gb = self._mem_total_gb
+        batch_fields = self._batch_fields
 
         for i in range(self._gpu_count):
+            keys = all_keys[i]  # key names precomputed in __init__
+            # A device in cooldown gets NaNs (keeping the columns aligned
+            # for mark()/slice() windows) without issuing any NVML calls.
+            if now < dead_until[i]:
+                for key in keys:
+                    gpu_data[key] = _NAN
+                continue
             try:
-                handle = nvmlDeviceGetHandleByIndex(i)
+                if dead_until[i]:
+                    # Cooldown just expired: the old handle may be stale
+                    # after a driver reload, so look it up again before use,
+                    # and refresh the cached total in case the device was
+                    # repartitioned while it was away.
+                    handles[i] = nvmlDeviceGetHandleByIndex(i)
+                    mem_total_gb[i] = get_mem(handles[i]).total * _INV_GB
+                    dead_until[i] = 0.0
+                handle = handles[i]  # cached in __init__
 
-                # Utilization
-                utilization = nvmlDeviceGetUtilizationRates(handle)
-                gpu_data[f"gpu_{i}_utilization_percent"] = utilization.gpu
-                gpu_data[f"gpu_{i}_memory_utilization_percent"] = utilization.memory  # Memory controller utilization
+                utilization = get_util(handle)  # .memory is controller utilization
+                mem_info = get_mem(handle)
+                temperature = get_temp(handle, NVML_TEMP_GPU)
 
-                # Memory Info
-                mem_info = nvmlDeviceGetMemoryInfo(handle)
-                gpu_data[f"gpu_{i}_memory_used_gb"] = mem_info.used / gb_divisor
-                gpu_data[f"gpu_{i}_memory_total_gb"] = mem_info.total / gb_divisor
-                gpu_data[f"gpu_{i}_memory_free_gb"] = mem_info.free / gb_divisor
+                # Values in the same order as self._keys[i]: utilization,
+                # memory-controller utilization, memory used/total/free,
+                # temperature, power.
+                values = (utilization.gpu, utilization.memory,
+                          mem_info.used * _INV_GB, mem_total_gb[i],
+                          mem_info.free * _INV_GB, temperature)
 
-                # Temperature
-                temperature = nvmlDeviceGetTemperature(handle, NVML_TEMP_GPU)
-                gpu_data[f"gpu_{i}_temperature_celsius"] = temperature
+                # Power Usage (probed once in __init__; the old
+                # hasattr(..., '__call__') check was always true)
+                if batch_fields:
+                    # Batched field-value read; one call regardless of how
+                    # many fields the probe in __init__ collected.
+                    field_values = nvmlDeviceGetFieldValues(handle, batch_fields)
+                    if field_values[0].nvmlReturn == 0:
+                        values += (_field_as_float(field_values[0]) * 1e-3,)  # Convert mW to W
+                elif self._power_supported[i]:
+                    values += (nvmlDeviceGetPowerUsage(handle) * 1e-3,)  # Convert mW to W
 
-                # Power Usage
-                if hasattr(nvmlDeviceGetPowerUsage, '__call__'):
-                    power_usage = nvmlDeviceGetPowerUsage(handle)
-                    gpu_data[f"gpu_{i}_power_watts"] = power_usage / 1000.0  # Convert mW to W
+                # One C-level dict update instead of seven interpreted
+                # STORE_SUBSCR assignments; zip stops at the shorter side,
+                # so a missing power reading just leaves that column
+                # unwritten for this sample.
+                gpu_data.update(zip(keys, values))
 
             except NVMLError as error:
-                print(f"Error collecting data for GPU {i}: {error}. Skipping this GPU's metrics for this sample.")
+                # The cooldown above already rate-limits this to once per
+                # _DEAD_COOLDOWN_S per device, so a failing card logs a
+                # couple of lines a minute instead of one per sample -
+                # and a warning, not a stdout write, from the sampler
+                # thread.
+                log.warning(f"Error collecting data for GPU {i}: {error}. Skipping this GPU for {_DEAD_COOLDOWN_S:.0f}s.")
+                dead_until[i] = now + _DEAD_COOLDOWN_S
                 # Fill with NaN for missing data
-                gpu_data[f"gpu_{i}_utilization_percent"] = np.nan
-                gpu_data[f"gpu_{i}_memory_utilization_percent"] = np.nan
-                gpu_data[f"gpu_{i}_memory_used_gb"] = np.nan
-                gpu_data[f"gpu_{i}_memory_total_gb"] = np.nan
-                gpu_data[f"gpu_{i}_memory_free_gb"] = np.nan
-                gpu_data[f"gpu_{i}_temperature_celsius"] = np.nan
-                gpu_data[f"gpu_{i}_power_watts"] = np.nan
+                for key in keys:
+                    gpu_data[key] = _NAN
                 continue
 
+        # Utilization and power move fastest when the cards are busy; while
+        # both sit still across samples the GPUs are idle and the poller
+        # backs off (1% / 1W epsilon). Missing power (unsupported telemetry)
+        # defaults to 0.0 so it never blocks the backoff; NaNs from a failed
+        # sample reset it.
+        self._adapt_interval(tuple(v for keys in all_keys
+                                   for v in (gpu_data.get(keys[0], _NAN),
+                                             gpu_data.get(keys[6], 0.0))))
         return gpu_data
 
-    def stop(self) -> list[dict]:
+    # Satisfies the BaseMetricCollector abstract method; __init__ rebinds
+    # the instance attribute to _collect_single on one-GPU machines (the
+    # common dev-box case), shedding the loop and index lookups per sample.
+    _collect_data_point = _collect_multi
+
+    def stop(self) -> dict:
         """Stops the current operation and shuts down the NVIDIA Management Library (NVML).
-    
+
     Returns:
-        A list of dictionaries containing the results of any previously collected data.
-        
+        A dictionary of per-metric sample arrays collected so far.
+
     Raises:
         NVMLError: If there is an error shutting down NVML."""
         collected_data = super().stop()
@@ -1,16 +1,37 @@
 # system_monitor/ram_collector.py
+import os
 import psutil
 from .base_metric_collector import BaseMetricCollector
 
+# On Linux the sampler reads /proc/meminfo directly instead of going through
+# psutil.virtual_memory(): one seek/read/parse of three header lines versus
+# a full meminfo parse plus a namedtuple of a dozen derived fields per
+# sample. Cheaper samples perturb the workload being measured less.
+_PROC_MEMINFO = '/proc/meminfo' if os.path.exists('/proc/meminfo') else None
+
+# Inside a memory-limited container /proc/meminfo (and psutil, which reads
+# it) describes the host, not the cgroup the run is actually confined to.
+# When cgroups v2 exposes the container's own accounting, prefer it: one
+# integer read against the limit from memory.max.
+_CG_MEM_CURRENT = '/sys/fs/cgroup/memory.current'
+_CG_MEM_MAX = '/sys/fs/cgroup/memory.max'
+
+# Reciprocals of kB- and bytes-per-GB, computed once: the sample paths
+# multiply by these instead of dividing, and float multiply is several times
+# cheaper than divide on current cores.
+_INV_KB_GB = 1.0 / (1024**2)
+_INV_GB = 1.0 / (1024**3)
+
 class RAMCollector(BaseMetricCollector):
     """A class for collecting and reporting real-time RAM usage statistics.
 
-    This collector periodically retrieves memory usage metrics from the system using the `psutil` library
-    and reports them as a dictionary containing total, available, used, and percentage of RAM in gigabytes.
-    
+    This collector periodically retrieves memory usage metrics from the system - directly from
+    /proc/meminfo on Linux, via the `psutil` library elsewhere - and reports them as a dictionary
+    containing total, available, used, and percentage of RAM in gigabytes.
+
     Attributes:
         - interval (float): The time interval in seconds between data collection cycles.
-        
+
     Methods:
         - _collect_data_point(): Collects and returns memory usage statistics in gigabytes."""
     def __init__(self, interval: float = 0.5):
@@ -19,6 +40,44 @@ class RAMCollector(BaseMetricCollector):
     Parameters:
     - interval (float): The time interval in seconds between updates. Defaults to 0.5 seconds."""
         super().__init__("RAM Monitor", interval)
+        self._cg_fd = None
+        self._cg_total_gb = 0.0
+        try:
+            # Only trust the cgroup numbers when an actual limit is set;
+            # an unlimited cgroup ('max') means host memory is the real
+            # budget and /proc/meminfo is the right source.
+            with open(_CG_MEM_MAX, 'rb') as f:
+                raw_limit = f.read().strip()
+            if raw_limit != b'max':
+                self._cg_total_gb = int(raw_limit) * _INV_GB
+                self._cg_fd = os.open(_CG_MEM_CURRENT, os.O_RDONLY)
+        except (OSError, ValueError):
+            self._cg_fd = None
+        self._meminfof = None
+        if self._cg_fd is None and _PROC_MEMINFO is not None:
+            try:
+                self._meminfof = open(_PROC_MEMINFO, 'rb')
+                # Validate the format once up front so a surprise layout
+                # falls back to psutil instead of failing every sample.
+                self._read_meminfo()
+            except (OSError, ValueError, KeyError):
+                self._meminfof = None
+
+    def _read_meminfo(self) -> tuple:
+        """Reads the head of /proc/meminfo and returns (total_kb, available_kb).
+
+        MemTotal and MemAvailable sit within the first few lines, so 2 KiB is
+        plenty; MemAvailable is the kernel's own estimate of memory usable
+        without swapping, which is what psutil's 'available' reports too."""
+        self._meminfof.seek(0)
+        fields = {}
+        for line in self._meminfof.read(2048).split(b'\n'):
+            key, _, rest = line.partition(b':')
+            if key in (b'MemTotal', b'MemAvailable'):
+                fields[key] = int(rest.split()[0])
+                if len(fields) == 2:
+                    break
+        return fields[b'MemTotal'], fields[b'MemAvailable']
 
     def _collect_data_point(self) -> dict:
         """Collects and returns system RAM usage metrics in gigabytes.
@@ -30,13 +89,41 @@ class RAMCollector(BaseMetricCollector):
         - 'used_ram_gb': Memory currently used in gigabytes.
         - 'ram_percent': Percentage of RAM that is being used.
 
-    This function uses the `psutil` library to retrieve system memory information and
-    formats it into gigabyte units for easier readability."""
-        mem = psutil.virtual_memory()
-        gb_divisor = (1024**3) # Convert bytes to GB
-        return {
-            "total_ram_gb": mem.total / gb_divisor,
-            "available_ram_gb": mem.available / gb_divisor,
-            "used_ram_gb": mem.used / gb_divisor,
-            "ram_percent": mem.percent
-        }
\ No newline at end of file
+    Inside a memory-limited cgroups v2 container the values reflect the
+    container's own budget (memory.current against memory.max); otherwise
+    on Linux they come straight from /proc/meminfo, and elsewhere this
+    falls back to `psutil.virtual_memory()`. Either way the figures are
+    formatted into gigabyte units for easier readability."""
+        if self._cg_fd is not None:
+            # Containerized path: one lseek/read of the cgroup's own usage
+            # counter against the cached limit from memory.max.
+            os.lseek(self._cg_fd, 0, os.SEEK_SET)
+            used_gb = int(os.read(self._cg_fd, 32)) * _INV_GB
+            total_gb = self._cg_total_gb
+            data = {
+                "total_ram_gb": total_gb,
+                "available_ram_gb": total_gb - used_gb,
+                "used_ram_gb": used_gb,
+                "ram_percent": 100.0 * used_gb / total_gb
+            }
+        elif self._meminfof is not None:
+            total_kb, available_kb = self._read_meminfo()
+            data = {
+                "total_ram_gb": total_kb * _INV_KB_GB,
+                "available_ram_gb": available_kb * _INV_KB_GB,
+                "used_ram_gb": (total_kb - available_kb) * _INV_KB_GB,
+                "ram_percent": 100.0 * (1.0 - available_kb / total_kb)
+            }
+        else:
+            mem = psutil.virtual_memory()
+            data = {
+                "total_ram_gb": mem.total * _INV_GB,
+                "available_ram_gb": mem.available * _INV_GB,
+                "used_ram_gb": mem.used * _INV_GB,
+                "ram_percent": mem.percent
+            }
+        # Back the poller off while memory pressure is flat within 1%; model
+        # loads and large allocations move it well past that and snap the
+        # rate back.
+        self._adapt_interval((data["ram_percent"],))
+        return data